@@ -0,0 +1,180 @@
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from review_app import reference
+from review_app.models import Category, FoodItem, FoodPlace, FoodReview, StatusModel
+from api.serializers import FoodItemSerializer
+from . import projections
+from .cache import cache_response
+from .conditional import adetail_validators, alist_validators, conditional_get, latest
+from .views import (
+    FoodItemDetailApiView,
+    FoodItemListApiView,
+    FoodPlaceListApiView,
+    FoodReviewApiView,
+)
+
+
+class AsyncAPIView(APIView):
+    """
+    ``APIView`` untuk ASGI: ``dispatch`` async sehingga handler ``async def``
+    berjalan di event loop tanpa thread per request. Autentikasi memakai
+    ``aauthenticate`` bila ada; handler sinkron (POST/PUT/DELETE warisan)
+    dijalankan lewat ``sync_to_async``.
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        # Sama dengan Request._authenticate, tanpa query sinkron di event loop
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+
+class FoodPlaceListAsyncApiView(AsyncAPIView, FoodPlaceListApiView):
+    async def aget_validators(self, request):
+        return await alist_validators(
+            FoodPlace.objects.all(),
+            "updated_on",
+            status_modified=latest(StatusModel, "last_modified"),
+        )
+
+    @conditional_get
+    @cache_response(FoodPlace, StatusModel, FoodReview)
+    async def get(self, request):
+        await reference.statuses.aload()
+        paginator = self.pagination_class()
+        places = await paginator.apaginate_queryset(
+            projections.food_places.queryset(FoodPlace.objects.all()),
+            request,
+            view=self,
+        )
+        return paginator.get_paginated_response(projections.food_places.data(places))
+
+
+class FoodItemListAsyncApiView(AsyncAPIView, FoodItemListApiView):
+    async def aget_validators(self, request):
+        await reference.statuses.aload()
+        return await alist_validators(
+            self.get_queryset(),
+            "last_modified",
+            place_modified=latest(FoodPlace, "updated_on"),
+            category_modified=latest(Category, "last_modified"),
+            status_modified=latest(StatusModel, "last_modified"),
+        )
+
+    @conditional_get
+    @cache_response(FoodItem, FoodPlace, Category, StatusModel, FoodReview)
+    async def get(self, request):
+        await reference.statuses.aload()
+        await reference.categories.aload()
+        items = projections.food_items.queryset(self.get_queryset())
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(items, request, view=self)
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Data makanan berhasil dibaca.",
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "data": projections.food_items.data(page),
+            }
+        )
+
+
+class FoodItemDetailAsyncApiView(AsyncAPIView, FoodItemDetailApiView):
+    async def aget_validators(self, request, pk):
+        return await adetail_validators(
+            FoodItem.objects,
+            pk,
+            "last_modified",
+            "place__updated_on",
+            "category__last_modified",
+            "status__last_modified",
+        )
+
+    @conditional_get
+    async def get(self, request, pk):
+        try:
+            food = await FoodItemSerializer.setup_eager_loading(FoodItem.objects).aget(pk=pk)
+        except FoodItem.DoesNotExist:
+            return Response(
+                {"message": "Data tidak ditemukan."}, status=status.HTTP_404_NOT_FOUND
+            )
+        await reference.statuses.aload()
+        await reference.categories.aload()
+        serializer = FoodItemSerializer(food)
+        return Response(serializer.data)
+
+
+class FoodReviewAsyncApiView(AsyncAPIView, FoodReviewApiView):
+    async def get(self, request):
+        reviews = projections.food_reviews.queryset(FoodReview.objects.all())
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(reviews, request, view=self)
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Review berhasil diambil",
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "data": projections.food_reviews.data(page),
+            }
+        )
@@ -0,0 +1,199 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+TOKEN_KEY = 'auth-token:{}'
+
+
+class TokenCache:
+    """LRU in-process dengan TTL: ``key token -> (user, token)``."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, user, token = entry
+            if expires <= time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return user, token
+
+    def set(self, key, user, token):
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.timeout, user, token)
+            self._by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._discard(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._discard(key)
+
+    def discard_user(self, user_id):
+        with self._lock:
+            for key in list(self._by_user.get(user_id, ())):
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].pk
+        keys = self._by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[user_id]
+
+
+_local = None
+_local_lock = threading.Lock()
+
+
+def local_cache():
+    global _local
+    if _local is None:
+        with _local_lock:
+            if _local is None:
+                _local = TokenCache(
+                    getattr(settings, 'TOKEN_CACHE_SIZE', 10000),
+                    getattr(settings, 'TOKEN_CACHE_TIMEOUT', 60),
+                )
+    return _local
+
+
+def shared_cache():
+    alias = getattr(settings, 'TOKEN_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def invalidate_token(key):
+    local_cache().discard(key)
+    cache = shared_cache()
+    if cache is not None:
+        cache.delete(TOKEN_KEY.format(key))
+
+
+def invalidate_user(user_id):
+    local_cache().discard_user(user_id)
+    cache = shared_cache()
+    if cache is not None:
+        # Proses lain mungkin yang mengisi cache bersama, cari key dari database
+        from rest_framework.authtoken.models import Token
+
+        keys = Token.objects.filter(user_id=user_id).values_list('key', flat=True)
+        cache.delete_many([TOKEN_KEY.format(key) for key in keys])
+
+
+def _detached(user, token):
+    # Salinan per request, objek di cache dipakai bersama antar thread
+    user = copy.copy(user)
+    token = copy.copy(token)
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` tanpa query ``Token JOIN User`` di setiap request.
+
+    Hasil lookup disimpan di LRU per proses (``TOKEN_CACHE_SIZE``,
+    ``TOKEN_CACHE_TIMEOUT`` detik) dan, bila ``TOKEN_CACHE_ALIAS`` diisi, juga
+    di cache Django bersama. Entri dihapus oleh sinyal di ``api.signals`` saat
+    token dihapus atau user berubah; LRU proses lain ikut kedaluwarsa paling
+    lambat setelah TTL.
+    """
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        return None if key is None else self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """Versi async untuk ``api.async_views``: query token hanya saat cache meleset."""
+        key = self.get_key(request)
+        return None if key is None else await self.aauthenticate_credentials(key)
+
+    def get_key(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+
+    def authenticate_credentials(self, key):
+        cached = self._cached(key)
+        if cached is not None:
+            return _detached(*cached)
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return self._remember(key, token)
+
+    async def aauthenticate_credentials(self, key):
+        cached = self._cached(key)
+        if cached is not None:
+            return _detached(*cached)
+        model = self.get_model()
+        try:
+            token = await model.objects.select_related('user').aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        return self._remember(key, token)
+
+    def _cached(self, key):
+        cache = local_cache()
+        cached = cache.get(key)
+        if cached is None:
+            shared = shared_cache()
+            if shared is not None:
+                cached = shared.get(TOKEN_KEY.format(key))
+                if cached is not None:
+                    cache.set(key, *cached)
+        return cached
+
+    def _remember(self, key, token):
+        user = token.user
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        cache = local_cache()
+        cache.set(key, user, token)
+        shared = shared_cache()
+        if shared is not None:
+            shared.set(TOKEN_KEY.format(key), (user, token), cache.timeout)
+        return _detached(user, token)
@@ -0,0 +1,118 @@
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from api import routing
+from review_app.versions import get_versions
+
+STATS_KEY = 'api-cache-stats:{}:{}'
+
+# Nama view yang memakai cache_response, untuk laporan statistik
+cached_views = []
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _record(view_name, outcome):
+    cache = _cache()
+    key = STATS_KEY.format(view_name, outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def cache_stats():
+    cache = _cache()
+    keys = [STATS_KEY.format(name, outcome) for name in cached_views for outcome in ('hit', 'miss')]
+    values = cache.get_many(keys)
+    stats = {}
+    for name in cached_views:
+        hits = values.get(STATS_KEY.format(name, 'hit'), 0)
+        misses = values.get(STATS_KEY.format(name, 'miss'), 0)
+        total = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def _make_key(view_name, request, versions):
+    query = sorted(request.query_params.lists())
+    # Body berisi URL absolut (link halaman, gambar), jadi host dan scheme ikut
+    # kunci. Hasil baca replika bisa tertinggal dari versi data: simpan terpisah
+    # agar klien yang dipaku ke primary setelah menulis tidak menerimanya.
+    source = 'replica' if routing.current_read_alias() else 'primary'
+    raw = repr((
+        request.scheme, request.get_host(), request.path, query,
+        request.accepted_renderer.format, source, versions,
+    ))
+    return f'api-response:{view_name}:{hashlib.sha1(raw.encode()).hexdigest()}'
+
+
+def cache_response(*models, timeout=None):
+    """
+    Cache hasil render handler GET, dikunci dengan view, query string dan versi
+    data ``models``. Versi dinaikkan oleh sinyal model (review_app.signals),
+    jadi perubahan data otomatis membuat kunci baru tanpa perlu menghapus cache.
+    """
+
+    def decorator(method):
+        view_name = method.__qualname__.split('.')[0]
+        cached_views.append(view_name)
+
+        def lookup(request):
+            key = _make_key(view_name, request, get_versions(models))
+            cached = _cache().get(key)
+            if cached is None:
+                _record(view_name, 'miss')
+                return key, None
+            _record(view_name, 'hit')
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return key, response
+
+        def remember(key, response):
+            if isinstance(response, Response) and response.status_code == 200:
+                def store(rendered):
+                    _cache().set(
+                        key,
+                        (rendered.content, rendered['Content-Type']),
+                        timeout if timeout is not None else getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300),
+                    )
+
+                response.add_post_render_callback(store)
+                response['X-Cache'] = 'MISS'
+            return response
+
+        if iscoroutinefunction(method):
+            @wraps(method)
+            async def async_wrapper(view, request, *args, **kwargs):
+                key, cached = lookup(request)
+                if cached is not None:
+                    return cached
+                return remember(key, await method(view, request, *args, **kwargs))
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            key, cached = lookup(request)
+            if cached is not None:
+                return cached
+            return remember(key, method(view, request, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
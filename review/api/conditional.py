@@ -0,0 +1,109 @@
+import hashlib
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.db.models import Count, Max, Subquery
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+
+
+def latest(model, field):
+    """Subquery nilai ``field`` terbaru di tabel ``model`` (untuk relasi yang ikut tampil)."""
+    return Max(Subquery(model.objects.order_by(f'-{field}').values(field)[:1]))
+
+
+def list_validators(queryset, updated_field, **related):
+    """
+    Validator list dalam satu query: jumlah baris, ``MAX(updated_field)`` dan
+    waktu perubahan terakhir tabel relasi. Hasilnya ``(nilai, last_modified)``.
+    """
+    row = queryset.order_by().aggregate(
+        count=Count('id'), last=Max(updated_field), **related
+    )
+    return _list_result(row)
+
+
+async def alist_validators(queryset, updated_field, **related):
+    row = await queryset.order_by().aaggregate(
+        count=Count('id'), last=Max(updated_field), **related
+    )
+    return _list_result(row)
+
+
+def _list_result(row):
+    stamps = [value for key, value in row.items() if key != 'count' and value]
+    return tuple(row.values()), max(stamps, default=None)
+
+
+def detail_validators(queryset, pk, *stamp_fields):
+    return _detail_result(queryset.filter(pk=pk).values_list(*stamp_fields).first())
+
+
+async def adetail_validators(queryset, pk, *stamp_fields):
+    return _detail_result(await queryset.filter(pk=pk).values_list(*stamp_fields).afirst())
+
+
+def _detail_result(row):
+    if row is None:
+        return None
+    return row, max(filter(None, row), default=None)
+
+
+def conditional_get(method):
+    """
+    Tambahkan ETag dan Last-Modified ke handler GET, dihitung dari
+    ``view.get_validators(request, ...)`` tanpa serialisasi. Request dengan
+    ``If-None-Match`` / ``If-Modified-Since`` yang cocok langsung dijawab 304.
+
+    Handler async memakai ``view.aget_validators``.
+    """
+
+    if iscoroutinefunction(method):
+        @wraps(method)
+        async def async_wrapper(view, request, *args, **kwargs):
+            validators = await view.aget_validators(request, *args, **kwargs)
+            if validators is None:
+                return await method(view, request, *args, **kwargs)
+            etag, timestamp = _validator_headers(view, request, validators)
+            response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+            if response is None:
+                response = await method(view, request, *args, **kwargs)
+            return _add_headers(response, etag, timestamp)
+
+        return async_wrapper
+
+    @wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        validators = view.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return method(view, request, *args, **kwargs)
+        etag, timestamp = _validator_headers(view, request, validators)
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = method(view, request, *args, **kwargs)
+        return _add_headers(response, etag, timestamp)
+
+    return wrapper
+
+
+def _validator_headers(view, request, validators):
+    values, last_modified = validators
+    raw = repr((
+        type(view).__name__,
+        request.path,
+        sorted(request.query_params.lists()),
+        request.accepted_renderer.format,
+        values,
+    ))
+    etag = quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def _add_headers(response, etag, timestamp):
+    if response.status_code in (200, 304):
+        response.headers['ETag'] = etag
+        if timestamp is not None:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        response.headers.setdefault('Cache-Control', 'private, no-cache')
+    return response
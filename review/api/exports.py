@@ -0,0 +1,150 @@
+import csv
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from review_app.models import FoodItem, FoodPlace, FoodReview
+
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+# Batas INTEGER SQLite / BIGINT; id lebih besar gagal saat query sudah di tengah stream
+MAX_ID = 2 ** 63 - 1
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class Export:
+    """
+    Definisi export: model, kolom ``values()`` dan filter query string.
+
+    Baris dibaca dengan ``iterator(chunk_size=...)`` sehingga memori tetap
+    datar berapa pun jumlah datanya.
+    """
+
+    model = None
+    date_field = None
+    fields = ()
+    expressions = {}
+    filters = {}
+
+    def validate(self, params):
+        # Diperiksa sebelum streaming dimulai, error di tengah stream tidak bisa jadi 400
+        errors = {}
+        for param in self.filters:
+            value = params.get(param)
+            # isdigit saja menerima digit Unicode (mis. "²") yang ditolak int()
+            if value and not (value.isascii() and value.isdigit() and int(value) <= MAX_ID):
+                errors[param] = 'Harus berupa id (angka).'
+        for param in ('date_from', 'date_to'):
+            value = params.get(param)
+            try:
+                valid = not value or parse_date(value) is not None
+            except ValueError:
+                valid = False
+            if not valid:
+                errors[param] = 'Format tanggal YYYY-MM-DD.'
+        return errors
+
+    def get_queryset(self, params):
+        queryset = self.model.objects.order_by('id')
+        for param, lookup in self.filters.items():
+            value = params.get(param)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        date_from = parse_date(params.get('date_from') or '')
+        date_to = parse_date(params.get('date_to') or '')
+        if date_from:
+            queryset = queryset.filter(**{f'{self.date_field}__gte': _start_of_day(date_from)})
+        if date_to:
+            queryset = queryset.filter(**{f'{self.date_field}__lt': _start_of_day(date_to + timedelta(days=1))})
+        return queryset.values(*self.fields, **self.expressions)
+
+    @property
+    def columns(self):
+        return list(self.fields) + list(self.expressions)
+
+    def rows(self, params):
+        return self.get_queryset(params).iterator(chunk_size=CHUNK_SIZE)
+
+    def stream_csv(self, params):
+        writer = csv.writer(Echo())
+        columns = self.columns
+        yield writer.writerow(columns)
+        buffer = []
+        for row in self.rows(params):
+            buffer.append(writer.writerow([row[column] for column in columns]))
+            if len(buffer) >= ROWS_PER_WRITE:
+                yield ''.join(buffer)
+                buffer = []
+        if buffer:
+            yield ''.join(buffer)
+
+    def stream_ndjson(self, params):
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        buffer = []
+        for row in self.rows(params):
+            buffer.append(encoder.encode(row) + '\n')
+            if len(buffer) >= ROWS_PER_WRITE:
+                yield ''.join(buffer)
+                buffer = []
+        if buffer:
+            yield ''.join(buffer)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class FoodReviewExport(Export):
+    model = FoodReview
+    date_field = 'created_at'
+    fields = ('id', 'food_id', 'place_id', 'rating', 'comment', 'distance_km', 'created_at')
+    expressions = {
+        'food_name': F('food__name'),
+        'place_name': F('place__name'),
+        'reviewer_username': F('reviewer__username'),
+    }
+    filters = {'place': 'place_id', 'food': 'food_id'}
+
+
+class FoodItemExport(Export):
+    model = FoodItem
+    date_field = 'created_on'
+    fields = (
+        'id', 'code', 'name', 'price', 'description', 'image', 'place_id',
+        'category_id', 'status_id', 'review_count', 'rating_avg', 'created_on',
+    )
+    expressions = {
+        'place_name': F('place__name'),
+        'category_name': F('category__name'),
+    }
+    filters = {'place': 'place_id', 'food': 'id'}
+
+
+class FoodPlaceExport(Export):
+    model = FoodPlace
+    date_field = 'created_on'
+    fields = (
+        'id', 'name', 'description', 'latitude', 'longitude', 'address',
+        'status_id', 'review_count', 'rating_avg', 'created_on',
+    )
+    expressions = {'status_name': F('status__name')}
+    filters = {'place': 'id'}
+
+
+EXPORTS = {
+    'reviews': FoodReviewExport(),
+    'foods': FoodItemExport(),
+    'places': FoodPlaceExport(),
+}
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
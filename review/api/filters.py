@@ -0,0 +1,16 @@
+import django_filters
+
+from review_app.models import FoodItem
+from review_app.reference import categories
+
+
+class FoodItemFilter(django_filters.FilterSet):
+    # Nama kategori dipetakan ke id lewat cache referensi, tanpa join ke tabel kategori
+    category__name = django_filters.CharFilter(method='filter_category_name')
+
+    class Meta:
+        model = FoodItem
+        fields = ['category__name']
+
+    def filter_category_name(self, queryset, name, value):
+        return queryset.filter(category_id__in=categories.pks_for_name(value))
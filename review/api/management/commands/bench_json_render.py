@@ -0,0 +1,131 @@
+import io
+import json
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+
+WORDS = "nasi goreng mie aceh sate padang rendang soto bakso gurih pedas manis enak mantap".split()
+
+
+def text(words):
+    return " ".join(random.choice(WORDS) for _ in range(words))
+
+
+def food(i, now, raw):
+    created = now - timedelta(minutes=i)
+    price = Decimal(random.randint(5, 150) * 1000) / 1
+    return {
+        "id": i,
+        "code": f"FD-{i:04d}",
+        "name": text(3).title(),
+        "price": price if raw else f"{price:.2f}",
+        "description": text(25),
+        "image": f"http://localhost:8000/media/foods/{i}.jpg",
+        "image_status": "ready",
+        "image_srcset": {
+            fmt: {size: f"http://localhost:8000/media/foods/{i}-{size}.{fmt}" for size in ("160", "320", "640")}
+            for fmt in ("webp", "jpeg")
+        },
+        "category": "Mie",
+        "place": f"Tempat {i % 40}",
+        "status": "Aktif",
+        "review_count": random.randint(0, 500),
+        "rating_avg": round(random.uniform(1, 5), 2),
+        "created_on": created if raw else created.isoformat().replace("+00:00", "Z"),
+    }
+
+
+def review(i, now, raw):
+    created = now - timedelta(seconds=i * 37)
+    return {
+        "id": i,
+        "food": random.randint(1, 2000),
+        "reviewer": f"reviewer{i % 50}",
+        "place": f"Tempat {i % 40}",
+        "rating": random.randint(1, 5),
+        "comment": text(30),
+        "distance_km": round(random.uniform(0, 20), 3),
+        "created_at": created if raw else created.isoformat().replace("+00:00", "Z"),
+    }
+
+
+def page(items, message, raw):
+    return {
+        "status": 200,
+        "message": _(message) if raw else message,
+        "next": "http://localhost:8000/api/foods/?cursor=eyJvIjoiLWNyZWF0ZWRfb24iLCJ2IjoiMjAyNiJ9&limit=50",
+        "previous": None,
+        "data": items,
+    }
+
+
+def payloads():
+    """Bentuk sama dengan response /api/foods/ dan /api/reviews/; ``raw`` berisi Decimal/datetime/lazy."""
+    now = timezone.now()
+    result = []
+    for raw in (False, True):
+        suffix = " (Decimal/datetime)" if raw else ""
+        result += [
+            ("foods 50" + suffix, page([food(i, now, raw) for i in range(50)], "Data makanan berhasil dibaca.", raw)),
+            ("reviews 50" + suffix, page([review(i, now, raw) for i in range(50)], "Review berhasil diambil", raw)),
+        ]
+    result.append(("foods 1000", page([food(i, now, False) for i in range(1000)], "Data makanan berhasil dibaca.", False)))
+    return result
+
+
+def rate(func, seconds):
+    func()
+    count = 0
+    deadline = time.perf_counter() + seconds
+    began = time.perf_counter()
+    while time.perf_counter() < deadline:
+        func()
+        count += 1
+    return count / (time.perf_counter() - began)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan throughput render dan parse JSON antara JSONRenderer/JSONParser "
+        "DRF (stdlib) dan api.renderers.FastJSONRenderer/api.parsers.FastJSONParser."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=1, help="Lama pengukuran per kasus.")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson tidak terpasang: FastJSONRenderer memakai stdlib.")
+        random.seed(1)
+        seconds = options["seconds"]
+        stdlib, fast = JSONRenderer(), FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), FastJSONParser()
+        self.stdout.write(
+            f"{'payload':<32}{'KB':>8}{'render stdlib/s':>17}{'render cepat/s':>16}{'x':>6}"
+            f"{'parse stdlib/s':>16}{'parse cepat/s':>15}{'x':>6}"
+        )
+        for name, data in payloads():
+            expected = stdlib.render(data)
+            rendered = fast.render(data)
+            if json.loads(rendered) != json.loads(expected):
+                raise CommandError(f"{name}: output FastJSONRenderer berbeda dengan JSONRenderer")
+
+            render_stdlib = rate(lambda: stdlib.render(data), seconds)
+            render_fast = rate(lambda: fast.render(data), seconds)
+            parse_stdlib = rate(lambda: stdlib_parser.parse(io.BytesIO(expected)), seconds)
+            parse_fast = rate(lambda: fast_parser.parse(io.BytesIO(expected)), seconds)
+            self.stdout.write(
+                f"{name:<32}{len(expected) / 1024:>8.1f}"
+                f"{render_stdlib:>17.0f}{render_fast:>16.0f}{render_fast / render_stdlib:>6.1f}"
+                f"{parse_stdlib:>16.0f}{parse_fast:>15.0f}{parse_fast / parse_stdlib:>6.1f}"
+            )
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import projections
+from api.serializers import FoodItemSerializer, FoodPlaceSerializer, FoodReviewReadSerializer
+from review_app.models import FoodItem, FoodPlace, FoodReview
+
+CASES = [
+    ("places", projections.food_places, FoodPlaceSerializer, FoodPlace),
+    ("foods", projections.food_items, FoodItemSerializer, FoodItem),
+    ("reviews", projections.food_reviews, FoodReviewReadSerializer, FoodReview),
+]
+
+
+def best(func, repeat):
+    func()
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan waktu serialisasi list per 1000 baris antara serializer DRF "
+        "(instance model) dan api.projections (values_list), dengan dan tanpa query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        self.stdout.write(
+            f"{'endpoint':<10}{'baris':>7}{'serializer ms':>15}{'proyeksi ms':>13}{'x':>6}"
+            f"{'serializer+query':>18}{'proyeksi+query':>16}{'x':>6}"
+        )
+        for name, projection, serializer_class, model in CASES:
+            queryset = model.objects.order_by("-id")[:rows]
+            instances = list(serializer_class.setup_eager_loading(queryset))
+            values = list(projection.queryset(queryset))
+            if not values:
+                raise CommandError(f"Tabel {model._meta.db_table} kosong.")
+            expected = serializer_class(instances, many=True).data
+            if projection.data(values) != [dict(item) for item in expected]:
+                raise CommandError(f"{name}: output proyeksi berbeda dengan {serializer_class.__name__}")
+
+            # Serialisasi saja, lalu termasuk query dan pembuatan objek/tuple
+            serializer = best(lambda: serializer_class(instances, many=True).data, repeat)
+            projected = best(lambda: projection.data(values), repeat)
+            serializer_all = best(
+                lambda: serializer_class(list(serializer_class.setup_eager_loading(queryset)), many=True).data, repeat
+            )
+            projected_all = best(lambda: projection.data(list(projection.queryset(queryset))), repeat)
+            scale = 1000 / len(values)
+            self.stdout.write(
+                f"{name:<10}{len(values):>7}"
+                f"{serializer * 1000 * scale:>15.2f}{projected * 1000 * scale:>13.2f}{serializer / projected:>6.1f}"
+                f"{serializer_all * 1000 * scale:>18.2f}{projected_all * 1000 * scale:>16.2f}"
+                f"{serializer_all / projected_all:>6.1f}"
+            )
@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.authtoken.models import Token
+
+from review_app.models import FoodItem, User
+
+BENCH_USERNAME = 'bench-wsgi-asgi'
+
+
+def endpoints():
+    food = FoodItem.objects.order_by('id').values_list('id', flat=True).first() or 1
+    return [
+        ('/api/places/', ''),
+        ('/api/foods/', 'limit=20'),
+        (f'/api/foods/{food}/', ''),
+        ('/api/reviews/', 'limit=20'),
+    ]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+def wsgi_environ(path, query, auth):
+    return {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_AUTHORIZATION': auth,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+
+
+def asgi_scope(path, query, auth):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'authorization', auth.encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+
+
+def run_wsgi(targets, auth, concurrency, seconds):
+    """Server WSGI berthread: ``concurrency`` thread, satu request per thread."""
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    deadline = time.perf_counter() + seconds
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        done, failed = [], 0
+        i = offset
+        while time.perf_counter() < deadline:
+            path, query = targets[i % len(targets)]
+            i += 1
+            statuses = []
+            began = time.perf_counter()
+            response = application(wsgi_environ(path, query, auth), lambda status, headers: statuses.append(status))
+            b''.join(response)
+            response.close()
+            done.append(time.perf_counter() - began)
+            failed += not statuses[0].startswith(('200', '404'))
+        connections.close_all()
+        with lock:
+            latencies.extend(done)
+            errors.append(failed)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return latencies, sum(errors)
+
+
+def run_asgi(targets, auth, concurrency, seconds):
+    """Server ASGI satu event loop: ``concurrency`` request bersamaan sebagai task."""
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+
+    async def request(path, query):
+        status = []
+        finished = asyncio.Event()
+        body_read = False
+
+        async def receive():
+            nonlocal body_read
+            if not body_read:
+                body_read = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif not message.get('more_body'):
+                finished.set()
+
+        await application(asgi_scope(path, query, auth), receive, send)
+        return status[0]
+
+    async def main():
+        deadline = time.perf_counter() + seconds
+        latencies = []
+        errors = 0
+
+        async def worker(offset):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                path, query = targets[i % len(targets)]
+                i += 1
+                began = time.perf_counter()
+                code = await request(path, query)
+                latencies.append(time.perf_counter() - began)
+                errors += code not in (200, 404)
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return latencies, errors
+
+    return asyncio.run(main())
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan request/detik dan latensi p99 endpoint baca utama antara WSGI "
+        "(view sinkron, thread) dan ASGI (view async, event loop) pada konkurensi tinggi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument(
+            "--with-cache",
+            action="store_true",
+            help="Pakai cache response; bawaannya dimatikan agar setiap request ke database.",
+        )
+        parser.add_argument("--server", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["server"]:
+            return self.run_server(options)
+
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME, defaults={"is_active": True})
+        token, _ = Token.objects.get_or_create(user=user)
+        try:
+            self.stdout.write(f"{'server':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'gagal':>8}")
+            for server in ("wsgi", "asgi"):
+                result = self.spawn(server, token.key, options)
+                self.stdout.write(
+                    f"{server:<8}{result['rps']:>10.0f}{result['p50'] * 1000:>10.1f}"
+                    f"{result['p99'] * 1000:>10.1f}{result['errors']:>8}"
+                )
+        finally:
+            user.delete()
+
+    def spawn(self, server, key, options):
+        # Proses terpisah: ASYNC_VIEWS dibaca saat urls dimuat
+        env = dict(os.environ, DJANGO_ASYNC_VIEWS="1" if server == "asgi" else "0", BENCH_TOKEN=key)
+        command = [
+            sys.executable, sys.argv[0], "bench_wsgi_asgi", "--server", server,
+            "--concurrency", str(options["concurrency"]), "--seconds", str(options["seconds"]),
+        ]
+        if options["with_cache"]:
+            command.append("--with-cache")
+        result = subprocess.run(command, env=env, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def run_server(self, options):
+        logging.getLogger("api.metrics").disabled = True
+        auth = "Token " + os.environ["BENCH_TOKEN"]
+        targets = endpoints()
+        run = run_asgi if options["server"] == "asgi" else run_wsgi
+        caches = settings.CACHES
+        if not options["with_cache"]:
+            caches = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with override_settings(CACHES=caches):
+            # Pemanasan: koneksi, cache token dan tabel referensi
+            run(targets, auth, 1, 0.5)
+            latencies, errors = run(targets, auth, options["concurrency"], options["seconds"])
+        self.stdout.write(json.dumps({
+            "rps": len(latencies) / options["seconds"],
+            "p50": percentile(latencies, 0.5),
+            "p99": percentile(latencies, 0.99),
+            "errors": errors,
+        }))
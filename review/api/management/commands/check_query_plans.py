@@ -0,0 +1,122 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from review_app.models import Category, FoodItem, FoodPlace, User
+
+# Tabel yang boleh di-scan penuh: katalog database dan tabel referensi kecil
+# yang sengaja dimuat utuh oleh review_app.reference
+ALLOWED_SCANS = {
+    'sqlite_master', 'sqlite_schema',
+    'review_app_statusmodel', 'review_app_category',
+}
+
+SQLITE_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS \w+)?$')
+POSTGRES_SCAN = re.compile(r'Seq Scan on (\w+)')
+
+
+def endpoints():
+    """Request kanonik tiap endpoint baca; id diambil dari data yang ada."""
+    place = FoodPlace.objects.order_by('id').values_list('id', 'latitude', 'longitude').first() or (1, 0, 0)
+    food = FoodItem.objects.order_by('id').values_list('id', 'name').first() or (1, 'nasi')
+    category = Category.objects.order_by('id').values_list('name', flat=True).first() or 'x'
+    word = (re.findall(r'\w+', food[1]) or ['nasi'])[0]
+    return [
+        ('places', '/api/places/', {}),
+        ('places page', '/api/places/', {'limit': 1}),
+        ('place detail', f'/api/places/{place[0]}/', {}),
+        ('places nearby', '/api/places/nearby/', {'lat': place[1], 'lon': place[2]}),
+        ('foods', '/api/foods/', {'limit': 1}),
+        ('foods by price', '/api/foods/', {'limit': 1, 'ordering': 'price'}),
+        ('food detail', f'/api/foods/{food[0]}/', {}),
+        ('foods filter', '/api/foods/filter/', {'limit': 1}),
+        ('foods filter by price', '/api/foods/filter/', {'limit': 1, 'ordering': '-price'}),
+        ('foods filter category', '/api/foods/filter/', {'limit': 1, 'category__name': category}),
+        ('reviews', '/api/reviews/', {'limit': 1}),
+        ('search', '/api/search/', {'q': word}),
+    ]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute('EXPLAIN ' + sql)
+        return [' '.join(str(value) for value in row) for row in cursor.fetchall()]
+
+
+def problems(plan, allowed):
+    found = []
+    # Urutan relevansi FTS (bm25) memang harus diurutkan dari hasil MATCH
+    ranked = any('VIRTUAL TABLE' in line for line in plan)
+    for line in plan:
+        if connection.vendor == 'sqlite':
+            match = SQLITE_SCAN.match(line.strip())
+            if match and match.group(1) not in allowed:
+                found.append(f'full scan {match.group(1)}')
+            if 'USE TEMP B-TREE' in line and not ranked:
+                found.append('temp b-tree sort')
+        elif connection.vendor == 'postgresql':
+            match = POSTGRES_SCAN.search(line)
+            if match and match.group(1) not in allowed:
+                found.append(f'full scan {match.group(1)}')
+            if re.match(r'\s*(->\s+)?(Incremental )?Sort\b', line):
+                found.append('sort')
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        "Jalankan EXPLAIN (QUERY PLAN) untuk query kanonik tiap endpoint API dan gagal "
+        "bila ada full scan atau sort dengan temp B-tree."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allow",
+            action="append",
+            default=[],
+            help="Nama tabel yang boleh di-scan penuh (bisa diulang).",
+        )
+        parser.add_argument("--verbose-plan", action="store_true", help="Tampilkan semua plan.")
+
+    def handle(self, *args, **options):
+        allowed = ALLOWED_SCANS | set(options["allow"])
+        client = APIClient()
+        client.force_authenticate(User(username="query-plan-check"))
+        failures = 0
+        checkable = connection.vendor in ("sqlite", "postgresql")
+        if not checkable:
+            self.stdout.write(f"Backend {connection.vendor}: plan ditampilkan tanpa pemeriksaan.")
+
+        # Cache response dimatikan agar setiap request benar-benar menjalankan query
+        with override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}):
+            checks = [(name, url, params, True) for name, url, params in endpoints()]
+            while checks:
+                name, url, params, follow = checks.pop(0)
+                with CaptureQueriesContext(connection) as ctx:
+                    response = client.get(url, params)
+                # Halaman berikutnya memakai filter cursor, plan-nya ikut diperiksa
+                next_url = response.json().get("next") if follow and response.status_code == 200 else None
+                if next_url:
+                    checks.insert(0, (f"{name} (cursor)", next_url, {}, False))
+                selects = [q["sql"] for q in ctx.captured_queries if q["sql"].lstrip().upper().startswith("SELECT")]
+                self.stdout.write(f"{name} ({response.status_code}): {len(selects)} query")
+                for sql in selects:
+                    plan = explain(sql)
+                    found = problems(plan, allowed) if checkable else []
+                    if found or options["verbose_plan"] or not checkable:
+                        self.stdout.write(f"  {sql}")
+                        for line in plan:
+                            self.stdout.write(f"    {line}")
+                    if found:
+                        failures += 1
+                        self.stdout.write(self.style.ERROR(f"  -> {', '.join(found)}"))
+
+        if failures:
+            raise CommandError(f"{failures} query memakai full scan atau temp B-tree.")
+        self.stdout.write(self.style.SUCCESS("Semua query kanonik memakai index."))
@@ -0,0 +1,235 @@
+import json
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api import routing
+
+logger = logging.getLogger("api.metrics")
+
+_metrics = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.view = None
+        self.query_budget = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.total_time = 0.0
+        self._render_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+    def start_render(self):
+        self._render_start = time.perf_counter()
+
+    def end_render(self, response):
+        if self._render_start is not None:
+            self.render_time = time.perf_counter() - self._render_start
+        return response
+
+    @property
+    def over_budget(self):
+        return self.query_budget is not None and self.queries > self.query_budget
+
+    def as_dict(self):
+        return {
+            "view": self.view,
+            "queries": self.queries,
+            "query_budget": self.query_budget,
+            "db_ms": round(self.db_time * 1000, 3),
+            "render_ms": round(self.render_time * 1000, 3),
+            "total_ms": round(self.total_time * 1000, 3),
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    ``execute_wrapper`` yang terpasang permanen di setiap koneksi. Query dicatat
+    ke metrics request di konteks yang menjalankannya; konteks ini ikut terbawa
+    ke thread ``sync_to_async`` tempat ORM berjalan di ASGI.
+    """
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection=None, **kwargs):
+    # Koneksi bersifat per thread: pasang di thread tempat request (dan query
+    # ORM-nya) berjalan, serta di setiap koneksi yang baru dibuka
+    for conn in [connection] if connection is not None else connections.all():
+        if record_query not in conn.execute_wrappers:
+            conn.execute_wrappers.append(record_query)
+
+
+# request_started dikirim lewat sync_to_async(thread_sensitive=True) di ASGI,
+# yaitu thread yang sama dengan query ORM request tersebut
+request_started.connect(install_query_recorder, dispatch_uid="api.metrics.request_started")
+connection_created.connect(install_query_recorder, dispatch_uid="api.metrics.connection_created")
+
+
+def get_query_budget(view_class, method):
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(method)
+    return budget
+
+
+class InstrumentationMiddleware:
+    """
+    Mencatat jumlah query, waktu DB, waktu render dan total latensi per request.
+
+    View dapat mendeklarasikan ``query_budget`` (angka, atau dict per method
+    HTTP). Hasilnya disimpan di ``response.metrics``; request yang melebihi
+    budget ditulis ke logger ``api.metrics`` (WARNING), semua request bila
+    ``API_METRICS_LOG`` aktif (INFO). Bila ``API_METRICS_HEADERS`` aktif
+    metrics dikirim sebagai header ``Server-Timing`` / ``X-DB-Queries``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.send_headers = getattr(settings, "API_METRICS_HEADERS", False)
+        self.log_requests = getattr(settings, "API_METRICS_LOG", False)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = request.metrics = RequestMetrics()
+        start = time.perf_counter()
+        install_query_recorder()
+        token = _metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    async def __acall__(self, request):
+        metrics = request.metrics = RequestMetrics()
+        start = time.perf_counter()
+        token = _metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.finish(request, response, metrics, start)
+
+    def finish(self, request, response, metrics, start):
+        metrics.total_time = time.perf_counter() - start
+        response.metrics = metrics
+
+        if metrics.view is not None:
+            data = dict(
+                metrics.as_dict(),
+                method=request.method,
+                path=request.path,
+                status=response.status_code,
+            )
+            if metrics.over_budget:
+                logger.warning(json.dumps(dict(data, event="query_budget_exceeded")))
+            elif self.log_requests:
+                logger.info(json.dumps(data))
+
+        if self.send_headers:
+            response["X-DB-Queries"] = str(metrics.queries)
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"db;dur={metrics.db_time * 1000:.3f}",
+                    f"render;dur={metrics.render_time * 1000:.3f}",
+                    f"total;dur={metrics.total_time * 1000:.3f}",
+                ]
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = getattr(request, "metrics", None)
+        if metrics is None:
+            return None
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        metrics.view = getattr(view_class, "__name__", view_func.__name__)
+        metrics.query_budget = get_query_budget(view_class, request.method)
+        return None
+
+    def process_template_response(self, request, response):
+        metrics = getattr(request, "metrics", None)
+        if metrics is not None:
+            metrics.start_render()
+            response.add_post_render_callback(metrics.end_render)
+        return response
+
+
+class ReadReplicaMiddleware:
+    """
+    Mengarahkan query baca view yang menandai ``read_replica = True`` ke alias
+    di ``DATABASE_READ_ALIASES`` (lewat ``api.routing.PrimaryReplicaRouter``).
+
+    Setelah request tulis yang berhasil, klien (token atau IP) dipaku ke
+    primary selama ``READ_AFTER_WRITE_SECONDS`` agar langsung membaca data
+    yang baru ditulisnya.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            routing.clear_read_alias()
+        return self.finish(request, response)
+
+    async def __acall__(self, request):
+        try:
+            response = await self.get_response(request)
+        finally:
+            routing.clear_read_alias()
+        return self.finish(request, response)
+
+    def finish(self, request, response):
+        if request.method not in self.SAFE_METHODS and response.status_code < 400:
+            routing.pin_to_primary(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in self.SAFE_METHODS:
+            return None
+        view_class = getattr(view_func, "cls", None) or getattr(
+            view_func, "view_class", None
+        )
+        if not getattr(view_class, "read_replica", False) or not routing.read_aliases():
+            return None
+        if not routing.is_pinned(request):
+            routing.use_read_alias()
+        return None
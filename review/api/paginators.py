@@ -1,12 +1,148 @@
+import base64
+import json
 from collections import OrderedDict
-from rest_framework import pagination
-from rest_framework.pagination import LimitOffsetPagination
 
-class CostumPagination(LimitOffsetPagination):
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import exceptions, pagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CostumPagination(pagination.BasePagination):
+    """
+    Keyset pagination berbasis cursor pada ``(field urutan, id)``.
+
+    Halaman berikutnya dicari dengan ``WHERE (field, id) > (nilai terakhir)``
+    sehingga biayanya sama di halaman mana pun.
+    """
+
     default_limit = 5
     limit_query_param = 'limit'
-    offset_query_param = 'offset'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
     min_limit = 1
     max_limit = 50
-    min_offset = 0
-    max_offset = 10
\ No newline at end of file
+    ordering = '-created_on'
+    invalid_cursor_message = 'Cursor tidak valid.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page([obj async for obj in queryset.aiterator()])
+
+    def page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        self.field, self.descending = self.get_ordering(request, view)
+        self.model_field = queryset.model._meta.get_field(self.field)
+
+        self.cursor = cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor['r'])
+
+        order = [self.field, 'id'] if self.field != 'id' else ['id']
+        if self.descending != reverse:
+            order = ['-' + name for name in order]
+        queryset = queryset.order_by(*order)
+        if cursor:
+            queryset = queryset.filter(self.after(cursor['v'], cursor['id'], reverse))
+        return queryset[:self.limit + 1]
+
+    def set_page(self, results):
+        cursor = self.cursor
+        reverse = bool(cursor and cursor['r'])
+        has_more = len(results) > self.limit
+        results = results[:self.limit]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if reverse:
+                self.next_position = results[-1]
+                self.previous_position = results[0] if has_more else None
+            else:
+                self.next_position = results[-1] if has_more else None
+                self.previous_position = results[0] if cursor else None
+        return results
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return max(self.min_limit, min(limit, self.max_limit))
+
+    def get_ordering(self, request, view):
+        default = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(default, (list, tuple)):
+            default = default[0]
+        allowed = getattr(view, 'ordering_fields', None) or []
+        ordering = request.query_params.get(self.ordering_query_param, '').strip()
+        if ordering.lstrip('-') not in allowed:
+            ordering = default
+        return ordering.lstrip('-'), ordering.startswith('-')
+
+    def after(self, value, pk, reverse):
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        if self.field == 'id':
+            return Q(**{f'id__{lookup}': pk})
+        return Q(**{f'{self.field}__{lookup}': value}) | Q(**{self.field: value, f'id__{lookup}': pk})
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            if cursor['o'] != self.ordering_key():
+                raise ValueError
+            cursor['v'] = self.model_field.to_python(cursor['v'])
+            cursor['id'] = int(cursor['id'])
+            cursor['r'] = bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise exceptions.ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return cursor
+
+    def encode_cursor(self, instance, reverse):
+        # instance: objek model atau baris values_list(named=True) dari api.projections
+        value = self.model_field.value_to_string(instance) if self.field != 'id' else None
+        cursor = {'o': self.ordering_key(), 'v': value, 'id': instance.id, 'r': int(reverse)}
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode())
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii').rstrip('='))
+
+    def ordering_key(self):
+        return ('-' if self.descending else '') + self.field
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
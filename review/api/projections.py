@@ -0,0 +1,198 @@
+import decimal
+
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+from review_app.reference import statuses
+from api.serializers import (
+    FoodItemSerializer,
+    FoodPlaceSerializer,
+    FoodReviewReadSerializer,
+    ReferenceNameField,
+)
+
+# to_representation yang hasilnya sama dengan nilai kolom (selain None)
+IDENTITY_METHODS = {
+    serializers.BooleanField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.ChoiceField.to_representation,
+    serializers.IntegerField.to_representation,
+    serializers.ReadOnlyField.to_representation,
+    relations.PrimaryKeyRelatedField.to_representation,
+}
+
+
+def converter(field):
+    """
+    Pembuat fungsi nilai kolom -> nilai JSON untuk ``field``. Dipanggil sekali
+    per ``Projection.data``: yang di ``to_representation`` dihitung per nilai
+    (zona waktu, context decimal, isi tabel referensi) di sini dihitung sekali.
+    """
+    if isinstance(field, ReferenceNameField):
+        return lambda: reference_converter(field.table)
+    if isinstance(field, serializers.FloatField):
+        return lambda: float
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format and output_format.lower() == ISO_8601:
+            return lambda: datetime_converter(field)
+    elif isinstance(field, serializers.DecimalField):
+        if (
+            getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            and field.decimal_places is not None
+            and not field.localize
+            and not field.normalize_output
+        ):
+            return lambda: decimal_converter(field)
+    return lambda: field.to_representation
+
+
+def reference_converter(table):
+    names = None
+
+    def convert(pk):
+        # Tabel dimuat saat nilai pertama, sama seperti ReferenceNameField
+        nonlocal names
+        if names is None:
+            names = table.names()
+        return names.get(pk)
+
+    return convert
+
+
+def datetime_converter(field):
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+    def convert(value):
+        if isinstance(value, str) or tz is None or value.tzinfo is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return convert
+
+
+def decimal_converter(field):
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    if field.rounding is not None:
+        context.rounding = field.rounding
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+        return '{:f}'.format(value.quantize(exponent, context=context))
+
+    return convert
+
+
+class Projection:
+    """
+    Mode read-only serializer untuk endpoint list: baris dibaca dengan
+    ``values_list(named=True)`` dan langsung disusun jadi dict dengan bentuk
+    yang sama seperti ``serializer_class``, tanpa membuat instance model dan
+    tanpa ``to_representation`` per field untuk kolom yang tidak perlu diubah.
+
+    Kolom dan konversi diturunkan dari field serializer; ``columns`` mengganti
+    kolom sebuah field, atau ``(kolom, field)`` bila konversinya juga beda
+    (mis. ``to_representation`` serializer yang menimpa nilai). Field
+    ``SerializerMethodField`` menerima baris (namedtuple), bukan nilai kolom.
+    ``extra`` adalah kolom yang dibutuhkan pagination tapi tidak ditampilkan.
+    """
+
+    def __init__(self, serializer_class, columns=None, extra=()):
+        self.serializer_class = serializer_class
+        self.overrides = columns or {}
+        self.extra = tuple(extra)
+        self._compiled = None
+
+    def compile(self):
+        serializer = self.serializer_class()
+        model = self.serializer_class.Meta.model
+        keys, columns, converters, files, methods, skip = [], [], [], [], [], []
+        for key, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            index = len(keys)
+            override = self.overrides.get(key)
+            output = field
+            if isinstance(override, tuple):
+                column, output = override
+            else:
+                column = override or self.column_for(model, field)
+            keys.append(key)
+            columns.append(column)
+
+            if isinstance(output, serializers.SerializerMethodField):
+                methods.append((key, output.method_name))
+            elif isinstance(output, serializers.FileField):
+                files.append((key, index, model._meta.get_field(output.source).storage))
+            elif type(output).to_representation not in IDENTITY_METHODS:
+                converters.append((key, index, converter(output)))
+
+            # Relasi null pada source bertitik: DRF melewati field (SkipField)
+            if len(field.source_attrs) > 1 and field.default is empty and not field.allow_null:
+                skip.append(key)
+
+        columns += [column for column in self.extra if column not in columns]
+        return tuple(keys), tuple(columns), tuple(converters), tuple(files), tuple(methods), tuple(skip)
+
+    @staticmethod
+    def column_for(model, field):
+        if isinstance(field, relations.RelatedField) and len(field.source_attrs) == 1:
+            return model._meta.get_field(field.source).attname
+        return '__'.join(field.source_attrs)
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            self._compiled = self.compile()
+        return self._compiled
+
+    def queryset(self, queryset):
+        return queryset.values_list(*self.compiled[1], named=True)
+
+    def data(self, rows, context=None):
+        """Daftar dict sama dengan ``serializer_class(rows, many=True, context=context).data``."""
+        keys, _, converters, files, methods, skip = self.compiled
+        context = context or {}
+        request = context.get('request')
+        serializer = self.serializer_class(context=context)
+        converters = [(key, index, make()) for key, index, make in converters]
+        methods = [(key, getattr(serializer, name)) for key, name in methods]
+        result = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            for key, index, func in converters:
+                value = row[index]
+                if value is not None:
+                    item[key] = func(value)
+            for key, index, storage in files:
+                name = row[index]
+                if name is not None:
+                    url = storage.url(name) if name else None
+                    item[key] = request.build_absolute_uri(url) if url and request is not None else url
+            for key, method in methods:
+                item[key] = method(row)
+            for key in skip:
+                if item[key] is None:
+                    del item[key]
+            result.append(item)
+        return result
+
+
+food_places = Projection(
+    FoodPlaceSerializer,
+    # FoodPlaceSerializer.to_representation mengganti id status dengan namanya
+    columns={'status': ('status_id', ReferenceNameField(statuses))},
+    extra=('created_on',),
+)
+food_items = Projection(
+    FoodItemSerializer,
+    columns={'place': 'place__name', 'image_srcset': 'image_renditions'},
+    extra=('created_on',),
+)
+food_reviews = Projection(FoodReviewReadSerializer)
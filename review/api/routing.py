@@ -0,0 +1,87 @@
+import hashlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY = 'db-pin:{}'
+
+# Model yang selalu dibaca dari primary: autentikasi dan sesi harus langsung
+# melihat token/user yang baru dibuat
+PRIMARY_ONLY_APPS = {'admin', 'auth', 'authtoken', 'contenttypes', 'sessions'}
+PRIMARY_ONLY_MODELS = {'review_app.user'}
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def read_aliases():
+    # Alias yang menunjuk ke database primary (mirror saat test) tidak perlu dipisah
+    primary = connections[DEFAULT_DB_ALIAS].settings_dict['NAME']
+    return [
+        alias for alias in getattr(settings, 'DATABASE_READ_ALIASES', [])
+        if connections[alias].settings_dict['NAME'] != primary
+    ]
+
+
+def use_read_alias():
+    """Arahkan baca di konteks (thread/task request) ini ke salah satu alias baca."""
+    aliases = read_aliases()
+    if aliases:
+        _read_alias.set(random.choice(aliases))
+
+
+def current_read_alias():
+    """Alias baca aktif di konteks ini; ``None`` berarti membaca dari primary."""
+    return _read_alias.get()
+
+
+def clear_read_alias():
+    # Bukan ContextVar.reset: di ASGI process_view berjalan di konteks salinan
+    # (sync_to_async), token-nya tidak berlaku di konteks middleware
+    _read_alias.set(None)
+
+
+def _cache():
+    return caches[getattr(settings, 'READ_REPLICA_CACHE_ALIAS', 'default')]
+
+
+def _pin_key(request):
+    # Token tidak dicek di sini, cukup sebagai identitas klien; tanpa token pakai IP
+    ident = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+    return PIN_KEY.format(hashlib.sha1(ident.encode()).hexdigest())
+
+
+def pin_to_primary(request):
+    seconds = getattr(settings, 'READ_AFTER_WRITE_SECONDS', 5)
+    if seconds and read_aliases():
+        _cache().set(_pin_key(request), 1, seconds)
+
+
+def is_pinned(request):
+    return _cache().get(_pin_key(request)) is not None
+
+
+class PrimaryReplicaRouter:
+    """
+    Tulis selalu ke primary (``default``). Baca ke alias di
+    ``DATABASE_READ_ALIASES`` hanya bila diaktifkan untuk request ini oleh
+    ``api.middleware.ReadReplicaMiddleware``; selain itu ke primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None:
+            return None
+        opts = model._meta
+        if opts.app_label in PRIMARY_ONLY_APPS or opts.label_lower in PRIMARY_ONLY_MODELS:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary dan replika berisi data yang sama
+        return True
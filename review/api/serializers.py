@@ -1,57 +1,161 @@
+import math
+
 from rest_framework import serializers
 from review_app.models import (
-    User, StatusModel, FoodPlace, Category, FoodItem, FoodReview
+    User, FoodPlace, Category, FoodItem, FoodReview
 )
 from django.contrib.auth import authenticate
 from rest_framework.validators import UniqueValidator
 from django.core.exceptions import ValidationError
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import viewsets
+from django.core.files.storage import default_storage
+from review_app.geo import haversine_km
+from review_app.images import ImageLimitError, check_image_limits
+from review_app.reference import categories, statuses
+
+
+class EagerLoadingMixin:
+    # Relasi yang dibaca saat serialisasi, dimuat sekaligus oleh view
+    select_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        return queryset.select_related(*cls.select_related_fields)
+
+
+class ReferenceNameField(serializers.ReadOnlyField):
+    """Nama objek referensi dari ``review_app.reference``; dipakai dengan ``source='<fk>_id'``."""
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        super().__init__(**kwargs)
 
+    def to_representation(self, value):
+        return self.table.name(value)
 
-class FoodPlaceSerializer(serializers.ModelSerializer):
-    status = serializers.PrimaryKeyRelatedField(queryset=StatusModel.objects.all())
+
+class ReferencePrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` yang memvalidasi pk lewat cache referensi, bukan query."""
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        kwargs.setdefault('queryset', table.model.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = self.table.get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class FoodPlaceSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    status = ReferencePrimaryKeyField(statuses)
 
     class Meta:
         model = FoodPlace
-        fields = ['id', 'name', 'description', 'latitude', 'longitude', 'address', 'status']
+        fields = ['id', 'name', 'description', 'latitude', 'longitude', 'address', 'status', 'review_count', 'rating_avg']
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         # Ubah ID status menjadi string-nya
-        rep['status'] = str(instance.status)
+        rep['status'] = statuses.name(instance.status_id)
         return rep
 
 
-class CategorySerializer(serializers.ModelSerializer):
-    status = serializers.StringRelatedField()
+class FoodPlaceNearbySerializer(FoodPlaceSerializer):
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta(FoodPlaceSerializer.Meta):
+        fields = FoodPlaceSerializer.Meta.fields + ['distance_km']
+
+
+class CategorySerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    status = ReferenceNameField(statuses, source='status_id')
 
     class Meta:
         model = Category
         fields = ['id', 'name', 'status']
 
 
-class FoodItemSerializer(serializers.ModelSerializer):
-    category = serializers.StringRelatedField()
+class FoodItemSerializer(EagerLoadingMixin, serializers.ModelSerializer):
+    category = ReferenceNameField(categories, source='category_id')
     place = serializers.StringRelatedField()
-    status = serializers.StringRelatedField()
+    status = ReferenceNameField(statuses, source='status_id')
+    image_srcset = serializers.SerializerMethodField()
+    select_related_fields = ('place',)
 
     class Meta:
         model = FoodItem
-        fields = ['id', 'code', 'name', 'price', 'description', 'image', 'category', 'place', 'status']
-
-
-class FoodReviewReadSerializer(serializers.ModelSerializer):
+        fields = ['id', 'code', 'name', 'price', 'description', 'image', 'image_status', 'image_srcset', 'category', 'place', 'status', 'review_count', 'rating_avg']
+
+    def validate_image(self, value):
+        if value:
+            try:
+                check_image_limits(value, value.size)
+            except ImageLimitError as exc:
+                raise serializers.ValidationError(str(exc))
+            value.seek(0)
+        return value
+
+    def get_image_srcset(self, instance):
+        # {"webp": {"160": url, ...}, "jpeg": {...}} untuk dipakai sebagai srcset
+        request = self.context.get('request')
+        srcset = {}
+        for size, formats in instance.image_renditions.items():
+            for fmt, name in formats.items():
+                url = default_storage.url(name)
+                if request is not None:
+                    url = request.build_absolute_uri(url)
+                srcset.setdefault(fmt, {})[size] = url
+        return srcset
+
+
+class FoodReviewReadSerializer(EagerLoadingMixin, serializers.ModelSerializer):
     reviewer = serializers.CharField(source='reviewer.username', read_only=True)
     place = serializers.CharField(source='place.name', read_only=True)
+    select_related_fields = ('reviewer', 'place')
     class Meta:
         model = FoodReview
         fields = ['id', 'food', 'reviewer', 'place', 'rating', 'comment', 'distance_km', 'created_at']
         
 class FoodReviewWriteSerializer(serializers.ModelSerializer):
+    food = serializers.PrimaryKeyRelatedField(queryset=FoodItem.objects.select_related('place'))
+    reviewer_latitude = serializers.FloatField(required=True, min_value=-90, max_value=90)
+    reviewer_longitude = serializers.FloatField(required=True, min_value=-180, max_value=180)
+
     class Meta:
         model = FoodReview
-        fields = ['id', 'food', 'rating', 'comment', 'distance_km']
+        fields = ['id', 'food', 'rating', 'comment', 'reviewer_latitude', 'reviewer_longitude', 'distance_km']
+        read_only_fields = ['distance_km']
+
+    def validate_reviewer_latitude(self, value):
+        return self._finite(value)
+
+    def validate_reviewer_longitude(self, value):
+        return self._finite(value)
+
+    def _finite(self, value):
+        # min_value/max_value meloloskan NaN karena perbandingannya selalu False
+        if not math.isfinite(value):
+            raise serializers.ValidationError('Koordinat harus berupa angka.')
+        return value
+
+    def validate(self, attrs):
+        # Jarak dihitung di server dari koordinat reviewer dan lokasi tempat makan
+        place = attrs['food'].place
+        attrs['distance_km'] = haversine_km(
+            attrs['reviewer_latitude'], attrs['reviewer_longitude'],
+            place.latitude, place.longitude,
+        )
+        return attrs
 
 class RegisterUserSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(
@@ -115,4 +219,5 @@ class UserSerializer(serializers.ModelSerializer):
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = User.objects.all()
+    ordering = 'id'
     serializer_class = UserSerializer
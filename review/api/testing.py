@@ -0,0 +1,19 @@
+class QueryBudgetMixin:
+    """
+    Mixin untuk ``TestCase``: memastikan request tidak melebihi ``query_budget``
+    view-nya. Membutuhkan ``api.middleware.InstrumentationMiddleware``.
+    """
+
+    def assertWithinQueryBudget(self, response, budget=None):
+        metrics = getattr(response, "metrics", None)
+        if metrics is None:
+            self.fail("Response tidak membawa metrics, cek InstrumentationMiddleware.")
+        if budget is None:
+            budget = metrics.query_budget
+        if budget is None:
+            self.fail(f"View {metrics.view} tidak mendeklarasikan query_budget.")
+        self.assertLessEqual(
+            metrics.queries,
+            budget,
+            f"{metrics.view} menjalankan {metrics.queries} query, budget {budget}.",
+        )
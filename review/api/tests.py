@@ -0,0 +1,909 @@
+import base64
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import path
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api import async_views, routing, views
+from api.authentication import TOKEN_KEY, TokenCache, local_cache
+from api.throttling import IPThrottle, TokenBucketThrottle
+from api.testing import QueryBudgetMixin
+from review_app import autocomplete, reference
+from review_app.models import Category, FoodItem, FoodPlace, FoodReview, StatusModel, User
+
+
+class ApiTestCase(TestCase):
+    """Klien terautentikasi dengan token dan cache kosong di setiap test."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reviewer', password='rahasia', is_reviewer=True)
+        cls.token = Token.objects.create(user=cls.user)
+        cls.active = StatusModel.objects.create(name='Aktif')
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        local_cache().clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    @contextmanager
+    def fake_replica(self):
+        """
+        Anggap ada replika ``replica1`` yang isinya database test primary.
+        Hasilnya daftar ``(model, alias)`` keputusan router untuk setiap baca.
+        """
+        reads = []
+        db_for_read = routing.PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            reads.append((model._meta.label_lower, alias))
+            return None if alias == 'replica1' else alias
+
+        with mock.patch.object(routing, 'read_aliases', return_value=['replica1']), \
+                mock.patch.object(routing.PrimaryReplicaRouter, 'db_for_read', record):
+            yield reads
+
+    def pin_to_primary(self):
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION='Token ' + self.token.key)
+        routing.pin_to_primary(request)
+
+    def create_place(self, name, latitude=3.59, longitude=98.67):
+        return FoodPlace.objects.create(
+            name=name, latitude=latitude, longitude=longitude, address='Jl. Test', status=self.active
+        )
+
+
+class FoodPlaceNearbyTest(ApiTestCase):
+    url = '/api/places/nearby/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for name, latitude in [('Jauh', 3.65), ('Dekat', 3.59), ('Sedang', 3.60), ('40 km', 3.95), ('68 km', 4.2)]:
+            FoodPlace.objects.create(
+                name=name, latitude=latitude, longitude=98.67, address='Jl. Test', status=cls.active
+            )
+
+    def names(self, **params):
+        response = self.client.get(self.url, {'lat': 3.59, 'lon': 98.67, **params})
+        self.assertEqual(response.status_code, 200)
+        return [place['name'] for place in response.json()['data']]
+
+    def test_sorted_by_distance(self):
+        self.assertEqual(self.names(radius_km=10), ['Dekat', 'Sedang', 'Jauh'])
+        distances = [place['distance_km'] for place in self.client.get(
+            self.url, {'lat': 3.59, 'lon': 98.67, 'radius_km': 10}
+        ).json()['data']]
+        self.assertEqual(distances, sorted(distances))
+        self.assertAlmostEqual(distances[0], 0)
+
+    def test_radius_cutoff(self):
+        self.assertEqual(self.names(radius_km=5), ['Dekat', 'Sedang'])
+
+    def test_radius_clamped_to_max(self):
+        self.assertEqual(self.names(radius_km=10000), ['Dekat', 'Sedang', 'Jauh', '40 km'])
+
+    def test_limit(self):
+        self.assertEqual(self.names(radius_km=50, limit=2), ['Dekat', 'Sedang'])
+
+    def test_invalid_parameters(self):
+        for params in [
+            {},
+            {'lat': 3.59},
+            {'lat': 'x', 'lon': 98.67},
+            {'lat': 91, 'lon': 98.67},
+            {'lat': 3.59, 'lon': -181},
+            {'lat': 3.59, 'lon': 98.67, 'radius_km': 0},
+            {'lat': 3.59, 'lon': 98.67, 'radius_km': -1},
+            {'lat': 3.59, 'lon': 98.67, 'radius_km': 'nan'},
+            {'lat': 3.59, 'lon': 98.67, 'radius_km': 'inf'},
+            {'lat': 'nan', 'lon': 98.67},
+            {'lat': 3.59, 'lon': '-inf'},
+        ]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['status'], 400)
+
+
+class KeysetPaginationTest(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        place = FoodPlace.objects.create(
+            name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active
+        )
+        # Harga kembar agar urutan bergantung pada id sebagai pemecah seri
+        for i, price in enumerate([3000, 1000, 2000, 1000, 3000, 1000, 2000, 5000, 1000, 4000, 2000]):
+            FoodItem.objects.create(place=place, name=f'Makanan {i}', price=price, description='', status=cls.active)
+
+    def rows(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        return body, [item['name'] for item in body.get('results', body.get('data'))]
+
+    def walk(self, url, params):
+        body, names = self.rows(self.client.get(url, params))
+        pages = [names]
+        while body['next']:
+            body, names = self.rows(self.client.get(body['next']))
+            pages.append(names)
+        return pages, body
+
+    def expected(self, *order):
+        return list(FoodItem.objects.order_by(*order).values_list('name', flat=True))
+
+    def test_forward_with_ties(self):
+        for ordering in ('price', '-price'):
+            with self.subTest(ordering=ordering):
+                pages, _ = self.walk('/api/foods/filter/', {'ordering': ordering, 'limit': 3})
+                self.assertEqual([len(page) for page in pages], [3, 3, 3, 2])
+                self.assertEqual(sum(pages, []), self.expected(ordering, ('-' if ordering[0] == '-' else '') + 'id'))
+
+    def test_backward(self):
+        pages, last = self.walk('/api/foods/filter/', {'ordering': 'price', 'limit': 4})
+        self.assertIsNone(last['next'])
+        body, names = self.rows(self.client.get(last['previous']))
+        backward = [names]
+        while body['previous']:
+            body, names = self.rows(self.client.get(body['previous']))
+            backward.append(names)
+        # Mundur dari halaman terakhir melewati halaman yang sama dengan urutan yang sama
+        self.assertEqual(backward[::-1] + [pages[-1]], pages)
+        self.assertIsNotNone(body['next'])
+
+    def test_same_created_on(self):
+        FoodItem.objects.update(created_on=FoodItem.objects.first().created_on)
+        pages, _ = self.walk('/api/foods/', {'limit': 5})
+        self.assertEqual(sum(pages, []), self.expected('-created_on', '-id'))
+
+    def cursor(self, **values):
+        cursor = {'o': 'price', 'v': '1000.00', 'id': 1, 'r': 0, **values}
+        return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode().rstrip('=')
+
+    def test_invalid_cursor(self):
+        for cursor in [
+            'bukan-cursor',
+            '!!!',
+            base64.urlsafe_b64encode(b'[1, 2]').decode(),
+            self.cursor(o='-price'),
+            self.cursor(v='murah'),
+            self.cursor(id='satu'),
+            self.cursor(r=None, id=None),
+        ]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get('/api/foods/filter/', {'ordering': 'price', 'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'cursor': ['Cursor tidak valid.']})
+
+    def test_valid_cursor(self):
+        response = self.client.get('/api/foods/filter/', {'ordering': 'price', 'cursor': self.cursor()})
+        self.assertEqual(response.status_code, 200)
+
+
+class QueryBudgetTest(QueryBudgetMixin, ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(name='Mie', status=cls.active)
+        cls.place = FoodPlace.objects.create(
+            name='Warung Mie', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active
+        )
+        cls.food = FoodItem.objects.create(
+            place=cls.place, name='Mie Aceh', price=25000, description='', status=cls.active, category=category
+        )
+        FoodReview.objects.create(
+            food=cls.food, place=cls.place, reviewer=cls.user, rating=4, comment='Mie enak', distance_km=1
+        )
+
+    def urls(self):
+        return [
+            '/api/places/',
+            '/api/places/nearby/?lat=3.59&lon=98.67',
+            f'/api/places/{self.place.pk}/',
+            '/api/foods/',
+            f'/api/foods/{self.food.pk}/',
+            '/api/foods/filter/',
+            '/api/reviews/',
+            '/api/search/?q=mie',
+            '/api/autocomplete/?prefix=mi',
+        ]
+
+    def clear_process_caches(self):
+        # Cache per proses: token, tabel referensi dan indeks autocomplete
+        local_cache().clear()
+        reference.statuses.invalidate()
+        reference.categories.invalidate()
+        autocomplete.index.built_at = None
+
+    def test_cold_and_warm(self):
+        for url in self.urls():
+            with self.subTest(url=url):
+                for cache in caches.all():
+                    cache.clear()
+                self.clear_process_caches()
+                cold = self.client.get(url)
+                self.assertEqual(cold.status_code, 200)
+                self.assertWithinQueryBudget(cold)
+                warm = self.client.get(url)
+                self.assertEqual(warm.status_code, 200)
+                self.assertWithinQueryBudget(warm)
+                self.assertLessEqual(warm.metrics.queries, cold.metrics.queries)
+
+    def test_response_cache_cold(self):
+        # Proses sudah hangat, response cache kosong (mis. setelah data berubah)
+        for url in self.urls():
+            self.client.get(url)
+        for url in self.urls():
+            with self.subTest(url=url):
+                for cache in caches.all():
+                    cache.clear()
+                self.assertWithinQueryBudget(self.client.get(url))
+
+    def test_over_budget_fails(self):
+        with self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(self.client.get('/api/foods/'), budget=0)
+
+    async def test_counted_under_asgi(self):
+        # Di ASGI query ORM berjalan di thread sync_to_async, bukan di event loop
+        headers = {'Authorization': 'Token ' + self.token.key}
+        for url in ['/api/places/', '/api/foods/', '/api/reviews/']:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url, headers=headers)
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(response.metrics.queries, 0)
+                self.assertGreater(response.metrics.db_time, 0)
+                self.assertWithinQueryBudget(response)
+        response = await self.async_client.get('/api/foods/?page_size=1', headers=headers)
+        with self.assertRaises(AssertionError):
+            self.assertWithinQueryBudget(response, budget=0)
+
+    def test_metrics_log(self):
+        with self.assertNoLogs('api.metrics'):
+            self.client.get('/api/foods/')
+        with mock.patch.object(views.FoodItemListApiView, 'query_budget', {'GET': 0}), \
+                self.assertLogs('api.metrics', 'WARNING') as logs:
+            self.client.get('/api/foods/?page_size=1')
+        self.assertEqual(json.loads(logs.records[0].getMessage())['event'], 'query_budget_exceeded')
+
+    @override_settings(API_METRICS_LOG=True)
+    def test_metrics_log_opt_in(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        logger = logging.getLogger('api.metrics')
+        with mock.patch.object(logger, 'level', logging.INFO), self.assertLogs(logger, 'INFO') as logs:
+            client.get('/api/foods/')
+        data = json.loads(logs.records[0].getMessage())
+        self.assertEqual((data['path'], data['status']), ('/api/foods/', 200))
+
+
+class CatalogImportTest(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        User.objects.filter(pk=cls.user.pk).update(is_staff=True)
+        cls.place = FoodPlace.objects.create(
+            name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active
+        )
+
+    def upload(self, kind, name, content):
+        response = self.client.post(
+            f'/api/import/{kind}/', {'file': SimpleUploadedFile(name, content)}, format='multipart'
+        )
+        return response
+
+    def result(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data']
+
+    def test_csv(self):
+        content = (
+            '\ufeffname,price,description,place,status\n'
+            'Mie Aceh,25000,Pedas,Warung A,Aktif\n'
+            f'Sate,"20000","Tusuk, bumbu kacang",{self.place.pk},{self.active.pk}\n'
+        ).encode()
+        data = self.result(self.upload('foods', 'makanan.csv', content))
+        self.assertEqual((data['created'], data['failed']), (2, 0))
+        self.assertEqual(
+            sorted(FoodItem.objects.values_list('name', 'description')),
+            [('Mie Aceh', 'Pedas'), ('Sate', 'Tusuk, bumbu kacang')],
+        )
+        self.assertTrue(all(FoodItem.objects.values_list('code', flat=True)))
+
+    def test_ndjson(self):
+        content = (
+            '{"name": "Warung B", "latitude": 3.6, "longitude": 98.7, "address": "Jl. B", "status": "Aktif"}\n'
+            '\n'
+            '{"name": "Warung C", "latitude": -6.2, "longitude": 106.8, "address": "Jl. C", "status": "Aktif"}\n'
+        ).encode()
+        data = self.result(self.upload('places', 'tempat.ndjson', content))
+        self.assertEqual((data['created'], data['failed']), (2, 0))
+        self.assertTrue(FoodPlace.objects.filter(name='Warung C').exists())
+
+    def test_row_errors(self):
+        content = (
+            'name,price,description,place,status\n'
+            'Mie Aceh,25000,Pedas,Warung A,Aktif\n'
+            'Sate,murah,,Warung A,Aktif\n'
+            'Bakso,10000,,Warung Z,Aktif\n'
+            ',10000,,Warung A,\n'
+        ).encode()
+        data = self.result(self.upload('foods', 'makanan.csv', content))
+        self.assertEqual((data['created'], data['failed']), (1, 3))
+        errors = {error['row']: error['errors'] for error in data['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4])
+        self.assertIn('price', errors[2])
+        self.assertIn('place', errors[3])
+        self.assertLessEqual({'name', 'status'}, set(errors[4]))
+
+    def test_ndjson_invalid_lines(self):
+        content = (
+            b'{"name": "Warung B", "latitude": 3.6, "longitude": 98.7, "address": "Jl. B", "status": "Aktif"}\n'
+            b'{"name": "Warung \xff", "latitude": 3.6}\n'
+            b'bukan json\n'
+            b'[1, 2]\n'
+            b'{"name": "Warung C", "latitude": 91, "longitude": 98.7, "address": "Jl. C", "status": "Aktif"}\n'
+            b'{"name": "Warung D", "latitude": 3.7, "longitude": 98.7, "address": "Jl. D", "status": "Aktif"}\n'
+        )
+        data = self.result(self.upload('places', 'tempat.ndjson', content))
+        self.assertEqual((data['created'], data['failed']), (2, 4))
+        errors = {error['row']: error['errors'] for error in data['errors']}
+        self.assertEqual(errors[2], {'non_field_errors': ['Teks bukan UTF-8 yang valid.']})
+        self.assertIn('latitude', errors[5])
+
+    def test_csv_invalid_encoding(self):
+        content = 'name,price,description,place,status\nBakmi Gorèng,15000,,Warung A,Aktif\n'.encode('latin-1')
+        data = self.result(self.upload('foods', 'makanan.csv', content))
+        self.assertEqual((data['created'], data['failed']), (0, 1))
+        self.assertEqual(
+            data['errors'][0]['errors'],
+            {'non_field_errors': ['Teks bukan UTF-8 yang valid. Sisa file tidak dibaca.']},
+        )
+
+    def test_malformed_csv(self):
+        # Field melebihi csv.field_size_limit()
+        content = (
+            b'name,price,description,place,status\nMie Aceh,25000,Pedas,Warung A,Aktif\n'
+            b'Sate,1,' + b'x' * 200000 + b',Warung A,Aktif\nBakso,1,,Warung A,Aktif\n'
+        )
+        data = self.result(self.upload('foods', 'makanan.csv', content))
+        self.assertEqual((data['created'], data['failed']), (1, 1))
+        self.assertIn('CSV tidak valid', data['errors'][0]['errors']['non_field_errors'][0])
+
+    def test_requires_admin_and_known_format(self):
+        self.assertEqual(self.upload('foods', 'makanan.txt', b'x').status_code, 400)
+        self.assertEqual(self.upload('kategori', 'kategori.csv', b'x').status_code, 404)
+        User.objects.filter(pk=self.user.pk).update(is_staff=False)
+        local_cache().clear()
+        self.assertEqual(self.upload('foods', 'makanan.csv', b'name\n').status_code, 403)
+
+
+class ExportTest(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.place = FoodPlace.objects.create(
+            name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active
+        )
+        cls.other = FoodPlace.objects.create(
+            name='Warung B', latitude=3.6, longitude=98.68, address='Jl. B', status=cls.active
+        )
+        for place in (cls.place, cls.other):
+            FoodItem.objects.create(place=place, name=f'Mie {place.name}', price=1000, description='', status=cls.active)
+
+    def export(self, kind, **params):
+        return self.client.get(f'/api/export/{kind}/', params)
+
+    def test_ndjson(self):
+        response = self.export('foods', place=self.place.pk)
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Mie Warung A'])
+        self.assertEqual(rows[0]['place_name'], 'Warung A')
+
+    def test_csv(self):
+        response = self.export('places', file_format='csv')
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,name,'))
+        self.assertEqual(len(lines), 3)
+
+    def test_invalid_filters(self):
+        for params in [
+            {'place': 'satu'},
+            {'place': '²'},
+            {'place': '١٢'},
+            {'food': '-1'},
+            {'place': str(2 ** 63)},
+            {'date_from': '2026-13-01'},
+            {'date_to': 'kemarin'},
+        ]:
+            with self.subTest(params=params):
+                response = self.export('foods', **params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], 'Filter tidak valid.')
+
+    def test_largest_id(self):
+        response = self.export('foods', place=str(2 ** 63 - 1))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'')
+
+
+class ResponseCacheTest(ApiTestCase):
+    url = '/api/foods/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        place = FoodPlace.objects.create(
+            name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active
+        )
+        for name in ('Mie Aceh', 'Sate'):
+            FoodItem.objects.create(place=place, name=name, price=1000, description='', status=cls.active)
+
+    def get(self, **extra):
+        response = self.client.get(self.url, {'limit': 1}, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Cache'], response.json()['next']
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.get()[0], 'MISS')
+        self.assertEqual(self.get()[0], 'HIT')
+
+    def test_host_and_scheme_in_key(self):
+        cached, link = self.get(HTTP_HOST='a.example')
+        self.assertEqual(cached, 'MISS')
+        self.assertTrue(link.startswith('http://a.example/'))
+
+        cached, link = self.get(HTTP_HOST='b.example')
+        self.assertEqual(cached, 'MISS')
+        self.assertTrue(link.startswith('http://b.example/'))
+
+        cached, link = self.get(HTTP_HOST='a.example', secure=True)
+        self.assertEqual(cached, 'MISS')
+        self.assertTrue(link.startswith('https://a.example/'))
+
+        self.assertEqual(self.get(HTTP_HOST='a.example'), ('HIT', link.replace('https', 'http', 1)))
+
+    def test_replica_reads_not_served_to_pinned_client(self):
+        with self.fake_replica() as reads:
+            self.assertEqual(self.get()[0], 'MISS')
+            self.assertIn(('review_app.fooditem', 'replica1'), reads)
+            self.assertEqual(self.get()[0], 'HIT')
+
+            # Setelah menulis klien dipaku ke primary: entri hasil replika tidak dipakai
+            self.pin_to_primary()
+            reads.clear()
+            self.assertEqual(self.get()[0], 'MISS')
+            self.assertNotIn(('review_app.fooditem', 'replica1'), reads)
+            self.assertEqual(self.get()[0], 'HIT')
+
+
+class TokenCacheTest(ApiTestCase):
+    url = '/api/places/'
+
+    def get(self, key=None):
+        if key is not None:
+            self.client.credentials(HTTP_AUTHORIZATION='Token ' + key)
+        return self.client.get(self.url)
+
+    def test_cached_after_first_request(self):
+        self.assertEqual(self.get().status_code, 200)
+        # Autocomplete tanpa query setelah indeksnya terbangun; sisa query hanya token
+        self.client.get('/api/autocomplete/', {'prefix': 'x'})
+        user, token = local_cache().get(self.token.key)
+        self.assertEqual((user.pk, token.key), (self.user.pk, self.token.key))
+        with self.assertNumQueries(0):
+            self.client.get('/api/autocomplete/', {'prefix': 'x'})
+
+    def test_deleted_token(self):
+        self.assertEqual(self.get().status_code, 200)
+        self.token.delete()
+        self.assertIsNone(local_cache().get(self.token.key))
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_rotated_token(self):
+        self.assertEqual(self.get().status_code, 200)
+        old_key = self.token.key
+        self.token.delete()
+        new_token = Token.objects.create(user=self.user)
+        self.assertEqual(self.get(old_key).status_code, 401)
+        self.assertEqual(self.get(new_token.key).status_code, 200)
+
+    def test_deactivated_user(self):
+        self.assertEqual(self.get().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(local_cache().get(self.token.key))
+        response = self.get()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['detail'], 'User inactive or deleted.')
+
+    def test_deleted_user(self):
+        self.assertEqual(self.get().status_code, 200)
+        User.objects.get(pk=self.user.pk).delete()
+        self.assertEqual(len(local_cache()), 0)
+        self.assertEqual(self.get().status_code, 401)
+
+    def test_last_login_keeps_entry(self):
+        self.assertEqual(self.get().status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.save(update_fields=['last_login'])
+        self.assertIsNotNone(local_cache().get(self.token.key))
+
+    @override_settings(TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache(self):
+        self.assertEqual(self.get().status_code, 200)
+        self.client.get('/api/autocomplete/', {'prefix': 'x'})
+        shared_key = TOKEN_KEY.format(self.token.key)
+        self.assertIsNotNone(caches['default'].get(shared_key))
+        # Proses lain: LRU kosong, entri diambil dari cache bersama
+        local_cache().clear()
+        with self.assertNumQueries(0):
+            self.client.get('/api/autocomplete/', {'prefix': 'x'})
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(caches['default'].get(shared_key))
+        self.assertEqual(self.get().status_code, 401)
+        self.token.delete()
+        self.assertIsNone(caches['default'].get(shared_key))
+
+
+class TokenCacheLruTest(TestCase):
+    def entry(self, pk):
+        user = User(pk=pk, username=f'user{pk}')
+        return user, Token(key=f'key{pk}', user=user)
+
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2, timeout=60)
+        for pk in (1, 2):
+            cache.set(f'key{pk}', *self.entry(pk))
+        cache.get('key1')
+        cache.set('key3', *self.entry(3))
+        self.assertIsNotNone(cache.get('key1'))
+        self.assertIsNone(cache.get('key2'))
+        self.assertEqual(len(cache), 2)
+
+    def test_expires(self):
+        cache = TokenCache(max_size=10, timeout=60)
+        with mock.patch('api.authentication.time.monotonic', return_value=1000.0):
+            cache.set('key1', *self.entry(1))
+        with mock.patch('api.authentication.time.monotonic', return_value=1059.0):
+            self.assertIsNotNone(cache.get('key1'))
+        with mock.patch('api.authentication.time.monotonic', return_value=1060.0):
+            self.assertIsNone(cache.get('key1'))
+        self.assertEqual(len(cache), 0)
+
+    def test_discard_user(self):
+        cache = TokenCache(max_size=10, timeout=60)
+        user, token = self.entry(1)
+        cache.set('key1', user, token)
+        cache.set('key1b', user, Token(key='key1b', user=user))
+        cache.set('key2', *self.entry(2))
+        cache.discard_user(1)
+        self.assertEqual((cache.get('key1'), cache.get('key1b')), (None, None))
+        self.assertIsNotNone(cache.get('key2'))
+
+
+class SlowCache:
+    """Cache dengan jeda setelah ``get``, memperlebar jendela balapan get/set."""
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def get(self, *args, **kwargs):
+        value = self._cache.get(*args, **kwargs)
+        time.sleep(0.005)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self._cache, name)
+
+
+class TokenBucketThrottleTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.request = RequestFactory().post('/api/login/', REMOTE_ADDR='10.0.0.1')
+
+    def throttle(self, capacity=5, period=60):
+        throttle = IPThrottle()
+        throttle.scope = 'test'
+        throttle.capacity, throttle.period = capacity, period
+        return throttle
+
+    def allow(self, at=None):
+        throttle = self.throttle()
+        if at is None:
+            return throttle.allow_request(self.request, None), throttle.wait()
+        with mock.patch('api.throttling.time.time', return_value=at):
+            return throttle.allow_request(self.request, None), throttle.wait()
+
+    def test_capacity_then_refill(self):
+        self.assertEqual([self.allow(1000.0)[0] for _ in range(5)], [True] * 5)
+        allowed, wait = self.allow(1000.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 12.0)
+        # Satu token per 12 detik
+        self.assertFalse(self.allow(1011.0)[0])
+        self.assertTrue(self.allow(1012.5)[0])
+        self.assertFalse(self.allow(1012.5)[0])
+        # Setelah lama diam, isi bucket tetap dibatasi kapasitas
+        self.assertEqual([self.allow(5000.0)[0] for _ in range(6)], [True] * 5 + [False])
+
+    def test_separate_idents(self):
+        for _ in range(5):
+            self.allow(1000.0)
+        self.assertFalse(self.allow(1000.0)[0])
+        self.request = RequestFactory().post('/api/login/', REMOTE_ADDR='10.0.0.2')
+        self.assertTrue(self.allow(1000.0)[0])
+
+    def test_concurrent_burst(self):
+        slow = SlowCache(caches['default'])
+        threads = 20
+        barrier = threading.Barrier(threads)
+        results = []
+
+        def attempt():
+            barrier.wait()
+            results.append(self.throttle().allow_request(self.request, None))
+
+        with mock.patch.object(TokenBucketThrottle, 'cache', new_callable=mock.PropertyMock, return_value=slow):
+            workers = [threading.Thread(target=attempt) for _ in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        self.assertEqual(len(results), threads)
+        self.assertEqual(results.count(True), 5)
+
+
+class LoginThrottleTest(ApiTestCase):
+    def test_429_after_capacity(self):
+        # login_username: 5/min
+        for _ in range(5):
+            response = self.client.post('/api/login/', {'username': 'reviewer', 'password': 'salah'}, format='json')
+            self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/login/', {'username': 'Reviewer', 'password': 'rahasia'}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        # Username lain dari IP yang sama masih boleh
+        response = self.client.post('/api/login/', {'username': 'lain', 'password': 'salah'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchApiTest(ApiTestCase):
+    url = '/api/search/'
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [(hit['kind'], hit['id']) for hit in response.json()['data']]
+
+    def test_results_follow_writes(self):
+        place = self.create_place('Warung Sate')
+        food = FoodItem.objects.create(place=place, name='Sate Padang', price=15000, description='', status=self.active)
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'padang', 'type': 'food'})), [('food', food.pk)])
+        food.name = 'Sate Madura'
+        food.save()
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'padang', 'type': 'food'})), [])
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'madura'})), [('food', food.pk)])
+        food.delete()
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': 'madura'})), [])
+
+    def test_query_syntax_does_not_raise(self):
+        place = self.create_place('Warung Sate')
+        for query in ['"sate', 'sate*', 'NEAR(sate', 'sate AND OR', '-sate', 'a:b', '"*^()']:
+            with self.subTest(query=query):
+                self.assertIn(self.client.get(self.url, {'q': query}).status_code, (200, 400))
+        self.assertEqual(self.ids(self.client.get(self.url, {'q': '"sate*'})), [('place', place.pk)])
+        response = self.client.get(self.url, {'q': '"*^()'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReadAfterWriteTest(ApiTestCase):
+    url = '/api/places/'
+
+    def setUp(self):
+        super().setUp()
+        self.create_place('Warung Lama')
+
+    def replica_reads(self, reads, client=None):
+        reads.clear()
+        response = (client or self.client).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return {alias for model, alias in reads if model == 'review_app.foodplace'}
+
+    def create(self, **data):
+        return self.client.post(self.url, {
+            'name': 'Warung Baru', 'latitude': 3.6, 'longitude': 98.7, 'address': 'Jl. Baru',
+            'status': self.active.pk, **data,
+        }, format='json')
+
+    def test_reads_go_to_replica(self):
+        with self.fake_replica() as reads:
+            self.assertEqual(self.replica_reads(reads), {'replica1'})
+            # Token dan user tetap dibaca dari primary
+            self.assertIn(('authtoken.token', 'default'), reads)
+
+    def test_pinned_to_primary_after_write(self):
+        other = APIClient()
+        other.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=User.objects.create_user('lain')).key)
+        with self.fake_replica() as reads:
+            self.assertEqual(self.create().status_code, 201)
+            self.assertEqual(self.replica_reads(reads), {None})
+            response = self.client.get(self.url)
+            self.assertIn('Warung Baru', [place['name'] for place in response.json()['results']])
+            # Klien lain tidak ikut dipaku
+            self.assertEqual(self.replica_reads(reads, other), {'replica1'})
+
+            # Setelah READ_AFTER_WRITE_SECONDS lewat, baca kembali ke replika
+            later = time.time() + settings.READ_AFTER_WRITE_SECONDS + 1
+            with mock.patch('time.time', return_value=later):
+                self.assertEqual(self.replica_reads(reads), {'replica1'})
+
+    def test_failed_write_does_not_pin(self):
+        with self.fake_replica() as reads:
+            self.assertEqual(self.create(latitude='x').status_code, 400)
+            self.assertEqual(self.replica_reads(reads), {'replica1'})
+
+    def test_no_replica_configured(self):
+        # Alias baca yang menunjuk ke database primary tidak dipakai
+        self.assertEqual(routing.read_aliases(), [])
+        aliases = []
+        db_for_read = routing.PrimaryReplicaRouter.db_for_read
+
+        def record(router, model, **hints):
+            aliases.append(db_for_read(router, model, **hints))
+            return aliases[-1]
+
+        with mock.patch.object(routing.PrimaryReplicaRouter, 'db_for_read', record):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(set(aliases), {None})
+
+
+class FoodReviewCreateTest(ApiTestCase):
+    url = '/api/reviews/'
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        place = FoodPlace.objects.create(name='Warung', latitude=0, longitude=0, address='Jl. A', status=cls.active)
+        cls.food = FoodItem.objects.create(place=place, name='Soto', price=10000, description='', status=cls.active)
+
+    def post(self, latitude, longitude):
+        return self.client.post(self.url, {
+            'food': self.food.pk, 'rating': 4, 'comment': 'Enak',
+            'reviewer_latitude': latitude, 'reviewer_longitude': longitude, 'distance_km': 0,
+        }, format='json')
+
+    def test_distance_computed_on_server(self):
+        response = self.post(0, 1)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertAlmostEqual(FoodReview.objects.get().distance_km, 111.195, places=2)
+
+    def test_non_finite_coordinates_rejected(self):
+        for latitude, longitude in [('nan', 1), (0, 'NaN'), ('inf', 1), (0, '-Infinity'), (91, 0)]:
+            with self.subTest(latitude=latitude, longitude=longitude):
+                self.assertEqual(self.post(latitude, longitude).status_code, 400)
+        self.assertFalse(FoodReview.objects.exists())
+
+
+# Jalur baca utama dengan view sinkron dan dengan view async (api.async_views),
+# terlepas dari DJANGO_ASYNC_VIEWS
+class SYNC_URLS:
+    urlpatterns = [
+        path('api/places/', views.FoodPlaceListApiView.as_view()),
+        path('api/foods/', views.FoodItemListApiView.as_view()),
+        path('api/foods/<int:pk>/', views.FoodItemDetailApiView.as_view()),
+        path('api/reviews/', views.FoodReviewApiView.as_view()),
+    ]
+
+
+class ASYNC_URLS:
+    urlpatterns = [
+        path('api/places/', async_views.FoodPlaceListAsyncApiView.as_view()),
+        path('api/foods/', async_views.FoodItemListAsyncApiView.as_view()),
+        path('api/foods/<int:pk>/', async_views.FoodItemDetailAsyncApiView.as_view()),
+        path('api/reviews/', async_views.FoodReviewAsyncApiView.as_view()),
+    ]
+
+
+class AsyncViewsTest(ApiTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        category = Category.objects.create(name='Mie', status=cls.active)
+        place = FoodPlace.objects.create(name='Warung Mie', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active)
+        cls.foods = [
+            FoodItem.objects.create(
+                place=place, name=f'Mie {i}', price=1000 * (i % 2 + 1), description='', status=cls.active, category=category
+            )
+            for i in range(5)
+        ]
+        for food in cls.foods[:3]:
+            FoodReview.objects.create(food=food, place=place, reviewer=cls.user, rating=4, comment='Enak', distance_km=1)
+
+    def sync_get(self, url, **headers):
+        with override_settings(ROOT_URLCONF=SYNC_URLS):
+            return self.client.get(url, headers=headers)
+
+    def async_get(self, url, token=None, **headers):
+        headers.setdefault('Authorization', 'Token ' + (token or self.token.key))
+        with override_settings(ROOT_URLCONF=ASYNC_URLS):
+            return async_to_sync(self.async_client.get)(url, headers=headers)
+
+    def clear_caches(self):
+        for cache in caches.all():
+            cache.clear()
+        local_cache().clear()
+
+    def test_parity_with_sync_views(self):
+        urls = ['/api/places/', '/api/foods/', '/api/foods/?limit=2', f'/api/foods/{self.foods[0].pk}/', '/api/reviews/']
+        for url in urls:
+            with self.subTest(url=url):
+                self.clear_caches()
+                expected = self.sync_get(url)
+                self.clear_caches()
+                response = self.async_get(url)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response.json(), expected.json())
+        # Token dibaca lewat aauthenticate lalu disimpan di cache proses
+        self.assertIsNotNone(local_cache().get(self.token.key))
+
+    def test_bad_token(self):
+        for url in ['/api/places/', '/api/foods/', f'/api/foods/{self.foods[0].pk}/', '/api/reviews/']:
+            with self.subTest(url=url):
+                self.assertEqual(self.async_get(url, token='salah').status_code, 401)
+        self.assertEqual(self.async_get('/api/foods/', Authorization='').status_code, 401)
+
+    def test_missing_detail(self):
+        response = self.async_get('/api/foods/999999/')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), self.sync_get('/api/foods/999999/').json())
+
+    def test_not_modified(self):
+        for url in ['/api/places/', '/api/foods/', f'/api/foods/{self.foods[0].pk}/']:
+            with self.subTest(url=url):
+                etag = self.async_get(url)['ETag']
+                self.assertEqual(self.async_get(url, **{'If-None-Match': etag}).status_code, 304)
+        etag = self.async_get('/api/foods/')['ETag']
+        self.foods[0].name = 'Mie Baru'
+        self.foods[0].save()
+        response = self.async_get('/api/foods/', **{'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def walk(self, url, link):
+        body = self.async_get(url).json()
+        pages = [[item['id'] for item in body['data']]]
+        while body[link]:
+            body = self.async_get(body[link]).json()
+            pages.append([item['id'] for item in body['data']])
+        return pages
+
+    def test_cursor_paging(self):
+        forward = self.walk('/api/foods/?limit=2', 'next')
+        self.assertEqual([len(page) for page in forward], [2, 2, 1])
+        self.assertEqual(sum(forward, []), list(FoodItem.objects.order_by('-created_on', '-id').values_list('id', flat=True)))
+
+        last = self.async_get('/api/foods/?limit=2').json()
+        while last['next']:
+            last = self.async_get(last['next']).json()
+        backward = self.walk(last['previous'], 'previous')
+        self.assertEqual(backward[::-1] + [forward[-1]], forward)
+
+        self.assertEqual(len(sum(self.walk('/api/reviews/?limit=2', 'next'), [])), 3)
+        self.assertEqual(self.async_get('/api/foods/?cursor=rusak').status_code, 400)
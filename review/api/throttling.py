@@ -0,0 +1,158 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+BUCKET_KEY = 'throttle-bucket:{}:{}'
+LOCK_KEY = 'throttle-lock:{}:{}'
+# Lock yatim (proses mati saat memegang lock) hilang sendiri setelah ini (detik)
+LOCK_TIMEOUT = 2
+# Lama menunggu lock sebelum request ditolak (detik)
+LOCK_WAIT = 0.1
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """``"10/min"`` -> ``(10, 60)``: kapasitas bucket dan periode isi ulang penuh."""
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket di cache bersama (``THROTTLE_CACHE_ALIAS``) sehingga semua
+    worker memakai kuota yang sama. Bucket berisi ``capacity`` token dan terisi
+    ulang ``capacity`` token per periode; tiap request memakai satu token.
+
+    Dicek di ``APIView.initial()``, jadi request yang ditolak tidak sampai ke
+    hashing password. Tarif diambil dari ``DEFAULT_THROTTLE_RATES[scope]``.
+    """
+
+    scope = None
+
+    def __init__(self):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        self.capacity, self.period = parse_rate(rate) if rate else (None, None)
+        self.wait_seconds = None
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        if self.capacity is None:
+            return True
+        ident = self.get_ident_key(request, view)
+        if not ident:
+            return True
+
+        key = BUCKET_KEY.format(self.scope, ident)
+        lock = LOCK_KEY.format(self.scope, ident)
+        refill = self.capacity / self.period
+        # get lalu set tidak atomik: tanpa lock, request bersamaan membaca isi
+        # bucket yang sama dan burst lolos melebihi kapasitas
+        if not self.acquire(lock):
+            # Request lain untuk ident yang sama sedang antre: itu sendiri burst
+            self.wait_seconds = 1 / refill
+            return False
+        try:
+            now = time.time()
+            tokens, stamp = self.cache.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - stamp) * refill)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                self.wait_seconds = (1 - tokens) / refill
+            # Bucket penuh lagi setelah satu periode, setelah itu key boleh hilang
+            self.cache.set(key, (tokens, now), self.period)
+        finally:
+            self.cache.delete(lock)
+        return allowed
+
+    def acquire(self, lock):
+        # cache.add atomik di semua backend cache Django (locmem, Redis, Memcached, DB)
+        deadline = time.monotonic() + LOCK_WAIT
+        delay = 0.001
+        while not self.cache.add(lock, 1, LOCK_TIMEOUT):
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 0.02)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    def get_ident_key(self, request, view):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(TokenBucketThrottle):
+    def get_ident_key(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        if not isinstance(username, str):
+            return None
+        return username.strip().lower()[:150] or None
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class LoginUsernameThrottle(UsernameThrottle):
+    scope = 'login_username'
+
+
+class RegisterIPThrottle(IPThrottle):
+    scope = 'register_ip'
+
+
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Server sedang sibuk, silakan coba lagi sebentar.'
+    default_code = 'hashing_busy'
+    wait = 1
+
+
+_hashing_lock = threading.Lock()
+_hashing_slots = None
+
+
+def _slots():
+    global _hashing_slots
+    if _hashing_slots is None:
+        with _hashing_lock:
+            if _hashing_slots is None:
+                _hashing_slots = threading.BoundedSemaphore(
+                    getattr(settings, 'PASSWORD_HASHING_CONCURRENCY', 2)
+                )
+    return _hashing_slots
+
+
+@contextmanager
+def hashing_slot():
+    """
+    Batasi jumlah hashing password yang berjalan bersamaan di proses ini
+    (``PASSWORD_HASHING_CONCURRENCY``) agar thread lain tetap bisa melayani
+    endpoint baca. Bila slot tidak didapat dalam
+    ``PASSWORD_HASHING_TIMEOUT`` detik, request dijawab 503.
+    """
+    slots = _slots()
+    if not slots.acquire(timeout=getattr(settings, 'PASSWORD_HASHING_TIMEOUT', 2)):
+        raise HashingBusy()
+    try:
+        yield
+    finally:
+        slots.release()
@@ -1,25 +1,42 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
     RegisterUserAPIView, LoginView,
-    FoodPlaceListApiView,
+    FoodPlaceListApiView, FoodPlaceNearbyApiView,
     FoodItemListApiView, FoodItemDetailApiView,
     FoodItemFilterApi, FoodReviewApiView, FoodPlaceDetailApiView,
-    UserViewSet
+    CatalogImportApiView, ExportApiView, CacheStatsApiView, SearchApiView,
+    AutocompleteApiView, UserViewSet
 )
 from rest_framework.routers import DefaultRouter
 
 app_name = 'api'
 
+if settings.ASYNC_VIEWS:
+    # Di ASGI jalur baca utama memakai view async (api.async_views)
+    from .async_views import (
+        FoodItemDetailAsyncApiView as FoodItemDetailApiView,
+        FoodItemListAsyncApiView as FoodItemListApiView,
+        FoodPlaceListAsyncApiView as FoodPlaceListApiView,
+        FoodReviewAsyncApiView as FoodReviewApiView,
+    )
+
 urlpatterns = [
     path('api/register/', RegisterUserAPIView.as_view()),
     path('api/login/', LoginView.as_view()),
     path('api/places/', FoodPlaceListApiView.as_view()),
+    path('api/places/nearby/', FoodPlaceNearbyApiView.as_view()),
     path('api/places/<int:pk>/', FoodPlaceDetailApiView.as_view()),
     path('api/foods/', FoodItemListApiView.as_view()),
     path('api/foods/<int:pk>/', FoodItemDetailApiView.as_view()),
     path('api/foods/filter/', FoodItemFilterApi.as_view()),
     path('api/reviews/', FoodReviewApiView.as_view()),
     path('api/reviews/<int:pk>/', FoodReviewApiView.as_view()),
+    path('api/import/<str:kind>/', CatalogImportApiView.as_view()),
+    path('api/export/<str:kind>/', ExportApiView.as_view()),
+    path('api/search/', SearchApiView.as_view()),
+    path('api/autocomplete/', AutocompleteApiView.as_view()),
+    path('api/cache/stats/', CacheStatsApiView.as_view()),
 ]
 
 router = DefaultRouter()
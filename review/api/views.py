@@ -1,15 +1,12 @@
+import math
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions, generics, filters
-from rest_framework.authentication import (
-    SessionAuthentication,
-    BasicAuthentication,
-    TokenAuthentication,
-)
 from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import login as django_login
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status
 from review_app.models import FoodPlace
@@ -17,6 +14,8 @@ from api.serializers import FoodPlaceSerializer
 from django.shortcuts import get_object_or_404
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from review_app import autocomplete, geo, reference, search
+from review_app.catalog_import import FORMATS, IMPORTERS, detect_format, read_rows
 from review_app.models import (
     User,
     FoodPlace,
@@ -27,6 +26,7 @@ from review_app.models import (
 )
 from api.serializers import (
     FoodPlaceSerializer,
+    FoodPlaceNearbySerializer,
     FoodItemSerializer,
     CategorySerializer,
     RegisterUserSerializer,
@@ -35,17 +35,28 @@ from api.serializers import (
     FoodReviewReadSerializer,
     FoodReviewWriteSerializer,
 )
+from .authentication import CachedTokenAuthentication
+from .cache import cache_response, cache_stats
+from .conditional import conditional_get, detail_validators, latest, list_validators
+from .exports import CONTENT_TYPES, EXPORTS
+from .filters import FoodItemFilter
+from . import projections
 from .paginators import CostumPagination
+from .throttling import LoginIPThrottle, LoginUsernameThrottle, RegisterIPThrottle, hashing_slot
 
 
 class RegisterUserAPIView(APIView):
     permission_classes = [AllowAny]
     serializer_class = RegisterUserSerializer
+    throttle_classes = [RegisterIPThrottle]
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
-        if serializer.is_valid():
-            serializer.save()
+        with hashing_slot():
+            valid = serializer.is_valid()
+            if valid:
+                serializer.save()
+        if valid:
             return Response(
                 {
                     "status": status.HTTP_201_CREATED,
@@ -64,10 +75,12 @@ class RegisterUserAPIView(APIView):
 class LoginView(APIView):
     permission_classes = [AllowAny]
     serializer_class = LoginSerializer
+    throttle_classes = [LoginIPThrottle, LoginUsernameThrottle]
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        with hashing_slot():
+            serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
         django_login(request, user)
         token, _ = Token.objects.get_or_create(user=user)
@@ -90,13 +103,31 @@ class LoginView(APIView):
 
 
 class FoodPlaceListApiView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    # Cache dingin: token, validator, data, tabel status
+    query_budget = {"GET": 4}
+    read_replica = True
+    pagination_class = CostumPagination
+    ordering = "-created_on"
 
+    def get_validators(self, request):
+        return list_validators(
+            FoodPlace.objects.all(),
+            "updated_on",
+            status_modified=latest(StatusModel, "last_modified"),
+        )
+
+    @conditional_get
+    @cache_response(FoodPlace, StatusModel, FoodReview)
     def get(self, request):
-        places = FoodPlace.objects.all()
-        serializer = FoodPlaceSerializer(places, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = self.pagination_class()
+        places = paginator.paginate_queryset(
+            projections.food_places.queryset(FoodPlace.objects.all()),
+            request,
+            view=self,
+        )
+        return paginator.get_paginated_response(projections.food_places.data(places))
 
     def post(self, request):
         serializer = FoodPlaceSerializer(data=request.data)
@@ -120,15 +151,89 @@ class FoodPlaceListApiView(APIView):
         )
 
 
+class FoodPlaceNearbyApiView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    # Cache dingin: token, data, tabel status
+    query_budget = 3
+    read_replica = True
+    default_radius_km = 5
+    max_radius_km = 50
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        try:
+            lat = float(request.query_params["lat"])
+            lon = float(request.query_params["lon"])
+            radius_km = float(
+                request.query_params.get("radius_km", self.default_radius_km)
+            )
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except (KeyError, ValueError):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Parameter lat dan lon wajib diisi dengan angka.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # NaN lolos dari perbandingan di bawah, inf merusak bounding box
+        if not all(map(math.isfinite, (lat, lon, radius_km))) or not (
+            -90 <= lat <= 90 and -180 <= lon <= 180
+        ) or radius_km <= 0:
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Koordinat atau radius tidak valid.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        radius_km = min(radius_km, self.max_radius_km)
+        limit = max(1, min(limit, self.max_limit))
+
+        candidates = FoodPlaceNearbySerializer.setup_eager_loading(
+            FoodPlace.objects.filter(geo.nearby_filter(lat, lon, radius_km))
+        )
+        places = []
+        for place in candidates:
+            place.distance_km = geo.haversine_km(
+                lat, lon, place.latitude, place.longitude
+            )
+            if place.distance_km <= radius_km:
+                places.append(place)
+        places.sort(key=lambda place: place.distance_km)
+
+        serializer = FoodPlaceNearbySerializer(places[:limit], many=True)
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Tempat makan terdekat berhasil dibaca.",
+                "data": serializer.data,
+            }
+        )
+
+
 class FoodPlaceDetailApiView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    # Cache dingin: token, validator, data, tabel status
+    query_budget = {"GET": 4}
+    read_replica = True
 
     def get_object(self, pk):
         try:
-            return FoodPlace.objects.get(pk=pk)
+            return FoodPlaceSerializer.setup_eager_loading(FoodPlace.objects).get(
+                pk=pk
+            )
         except FoodPlace.DoesNotExist:
             return None
 
+    def get_validators(self, request, pk):
+        return detail_validators(
+            FoodPlace.objects, pk, "updated_on", "status__last_modified"
+        )
+
+    @conditional_get
     def get(self, request, pk):
         place = self.get_object(pk)
         if not place:
@@ -166,20 +271,40 @@ class FoodPlaceDetailApiView(APIView):
 
 class FoodItemListApiView(APIView):
     parser_classes = [MultiPartParser, FormParser]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    # Cache dingin: token, tabel status, validator, data, tabel kategori
+    query_budget = {"GET": 5}
+    read_replica = True
+    pagination_class = CostumPagination
+    ordering = "-created_on"
+    ordering_fields = ["created_on", "price"]
 
-    def get(self, request):
-        active_status = StatusModel.objects.first()
-        items = FoodItem.objects.select_related("place", "category").filter(
-            status=active_status
+    def get_queryset(self):
+        return FoodItem.objects.filter(status=reference.active_status())
+
+    def get_validators(self, request):
+        return list_validators(
+            self.get_queryset(),
+            "last_modified",
+            place_modified=latest(FoodPlace, "updated_on"),
+            category_modified=latest(Category, "last_modified"),
+            status_modified=latest(StatusModel, "last_modified"),
         )
-        serializer = FoodItemSerializer(items, many=True)
+
+    @conditional_get
+    @cache_response(FoodItem, FoodPlace, Category, StatusModel, FoodReview)
+    def get(self, request):
+        items = projections.food_items.queryset(self.get_queryset())
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(items, request, view=self)
         return Response(
             {
                 "status": status.HTTP_200_OK,
                 "message": "Data makanan berhasil dibaca.",
-                "data": serializer.data,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "data": projections.food_items.data(page),
             }
         )
 
@@ -205,15 +330,29 @@ class FoodItemListApiView(APIView):
 
 class FoodItemDetailApiView(APIView):
     parser_classes = [MultiPartParser, FormParser]
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    # Cache dingin: token, validator, data, tabel kategori dan status
+    query_budget = {"GET": 5}
+    read_replica = True
 
     def get_object(self, pk):
         try:
-            return FoodItem.objects.get(pk=pk)
+            return FoodItemSerializer.setup_eager_loading(FoodItem.objects).get(pk=pk)
         except FoodItem.DoesNotExist:
             return None
 
+    def get_validators(self, request, pk):
+        return detail_validators(
+            FoodItem.objects,
+            pk,
+            "last_modified",
+            "place__updated_on",
+            "category__last_modified",
+            "status__last_modified",
+        )
+
+    @conditional_get
     def get(self, request, pk):
         food = self.get_object(pk)
         if not food:
@@ -257,26 +396,58 @@ class FoodItemDetailApiView(APIView):
 
 
 class FoodItemFilterApi(generics.ListAPIView):
-    queryset = FoodItem.objects.all()
+    queryset = FoodItemSerializer.setup_eager_loading(FoodItem.objects.all())
     serializer_class = FoodItemSerializer
     pagination_class = CostumPagination
     permission_classes = [permissions.IsAuthenticated]
+    # Cache dingin: token, validator, data, tabel kategori dan status
+    query_budget = 5
+    read_replica = True
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
-    filterset_fields = ["category__name"]
+    filterset_class = FoodItemFilter
     ordering_fields = ["created_on", "price"]
+    ordering = "-created_on"
+
+    def get_validators(self, request):
+        return list_validators(
+            self.filter_queryset(self.get_queryset()),
+            "last_modified",
+            place_modified=latest(FoodPlace, "updated_on"),
+            category_modified=latest(Category, "last_modified"),
+            status_modified=latest(StatusModel, "last_modified"),
+        )
+
+    @conditional_get
+    @cache_response(FoodItem, FoodPlace, Category, StatusModel, FoodReview)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        queryset = projections.food_items.queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            projections.food_items.data(page, self.get_serializer_context())
+        )
 
 
 class FoodReviewApiView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"GET": 2}
+    read_replica = True
+    pagination_class = CostumPagination
+    ordering = "-created_at"
 
     def get(self, request):
-        reviews = FoodReview.objects.select_related("food", "reviewer").all()
-        serializer = FoodReviewReadSerializer(reviews, many=True)
+        reviews = projections.food_reviews.queryset(FoodReview.objects.all())
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(reviews, request, view=self)
         return Response(
             {
                 "status": status.HTTP_200_OK,
                 "message": "Review berhasil diambil",
-                "data": serializer.data,
+                "next": paginator.get_next_link(),
+                "previous": paginator.get_previous_link(),
+                "data": projections.food_reviews.data(page),
             }
         )
 
@@ -284,12 +455,7 @@ class FoodReviewApiView(APIView):
         data = request.data.copy()
         serializer = FoodReviewWriteSerializer(data=data)
         if serializer.is_valid():
-            food_id = (
-                serializer.validated_data["food"].id
-                if hasattr(serializer.validated_data["food"], "id")
-                else serializer.validated_data["food"]
-            )
-            food = FoodItem.objects.get(pk=food_id)
+            food = serializer.validated_data["food"]
             review = serializer.save(
                 reviewer=request.user, place=food.place
             )
@@ -308,8 +474,7 @@ class FoodReviewApiView(APIView):
         data = request.data.copy()
         serializer = FoodReviewWriteSerializer(review, data=data)
         if serializer.is_valid():
-            food_id = serializer.validated_data['food'].id if hasattr(serializer.validated_data['food'], 'id') else serializer.validated_data['food']
-            food = FoodItem.objects.get(pk=food_id)
+            food = serializer.validated_data['food']
             updated_review = serializer.save(
                 reviewer=request.user,
                 place=food.place
@@ -321,3 +486,168 @@ class FoodReviewApiView(APIView):
                 "data": read_serializer.data,
             })
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CatalogImportApiView(APIView):
+    parser_classes = [MultiPartParser, FormParser]
+    permission_classes = [permissions.IsAdminUser]
+
+    def post(self, request, kind):
+        if kind not in IMPORTERS:
+            return Response(
+                {"message": "Jenis import tidak dikenal."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        upload = request.FILES.get("file")
+        fmt = request.data.get("format") or detect_format(getattr(upload, "name", ""))
+        if upload is None or fmt not in FORMATS:
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Kirim field file berformat CSV atau NDJSON.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        result = IMPORTERS[kind](user=request.user).run(read_rows(upload.file, fmt))
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": f"{result['created']} baris berhasil diimport, {result['failed']} gagal.",
+                "data": result,
+            }
+        )
+
+
+class ExportApiView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, kind):
+        export = EXPORTS.get(kind)
+        if export is None:
+            return Response(
+                {"message": "Jenis export tidak dikenal."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        fmt = request.query_params.get("file_format", "ndjson")
+        if fmt not in CONTENT_TYPES:
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "file_format harus csv atau ndjson.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        errors = export.validate(request.query_params)
+        if errors:
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Filter tidak valid.",
+                    "errors": errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stream = getattr(export, f"stream_{fmt}")(request.query_params)
+        response = StreamingHttpResponse(stream, content_type=CONTENT_TYPES[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+class SearchApiView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    # Cache dingin: token, cek tabel FTS, pencarian
+    query_budget = 3
+    default_limit = 20
+    max_limit = 50
+    kinds = ("food", "place", "review")
+
+    @cache_response(FoodItem, FoodPlace, FoodReview)
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not search.terms(query):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Parameter q wajib diisi.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        kinds = [kind for kind in request.query_params.get("type", "").split(",") if kind]
+        if any(kind not in self.kinds for kind in kinds):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": f"Parameter type harus salah satu dari: {', '.join(self.kinds)}.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Hasil pencarian.",
+                "data": search.search(query, kinds, limit),
+            }
+        )
+
+
+class AutocompleteApiView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    # Cache dingin: token dan pembangunan indeks (makanan, tempat, kategori);
+    # setelah itu tanpa query
+    query_budget = 4
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request):
+        prefix = request.query_params.get("prefix", "")
+        if not autocomplete.normalize(prefix):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Parameter prefix wajib diisi.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        kinds = [kind for kind in request.query_params.get("type", "").split(",") if kind]
+        if any(kind not in autocomplete.KINDS for kind in kinds):
+            return Response(
+                {
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": f"Parameter type harus salah satu dari: {', '.join(autocomplete.KINDS)}.",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            limit = self.default_limit
+        limit = max(1, min(limit, self.max_limit))
+
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Saran pencarian.",
+                "data": autocomplete.get_index().lookup(prefix, limit, kinds),
+            }
+        )
+
+
+class CacheStatsApiView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "status": status.HTTP_200_OK,
+                "message": "Statistik cache response.",
+                "data": cache_stats(),
+            }
+        )
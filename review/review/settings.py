@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -48,6 +49,8 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = "review_app.User"
 
 MIDDLEWARE = [
+    "api.middleware.InstrumentationMiddleware",
+    "api.middleware.ReadReplicaMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.security.SecurityMiddleware",
@@ -59,6 +62,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Kirim header Server-Timing / X-DB-Queries di setiap response API
+API_METRICS_HEADERS = False
+# Tulis metrics setiap request ke logger api.metrics (INFO); tanpa ini hanya
+# request yang melebihi query_budget yang dicatat (WARNING)
+API_METRICS_LOG = False
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 CORS_ALLOW_CREDENTIALS = True
@@ -93,6 +102,72 @@ DATABASES = {
     }
 }
 
+# Profil produksi SQLite: DJANGO_DATABASE_PROFILE=production
+# WAL agar pembaca tidak terblokir penulis, synchronous=NORMAL (aman dengan WAL),
+# busy_timeout untuk antre saat lock, mmap dan cache halaman yang lebih besar.
+# BEGIN IMMEDIATE mencegah "database is locked" saat transaksi baca naik jadi tulis.
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# Pragma yang dipasang ke tiap koneksi SQLite baru (review_app.sqlite)
+SQLITE_PRAGMAS = {}
+
+DATABASE_PROFILE = os.environ.get("DJANGO_DATABASE_PROFILE", "development")
+if DATABASE_PROFILE == "production":
+    DATABASES["default"].update(
+        {
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        }
+    )
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+
+# Replika baca: DJANGO_READ_REPLICAS=/path/replica1.sqlite3,/path/replica2.sqlite3
+# Replika lain (mis. Postgres) cukup ditambahkan ke DATABASES dengan alias selain "default".
+# Saat test, replika memakai database test primary (MIRROR).
+for i, name in enumerate(filter(None, os.environ.get("DJANGO_READ_REPLICAS", "").split(","))):
+    DATABASES[f"replica{i + 1}"] = dict(
+        DATABASES["default"], NAME=name.strip(), TEST={"MIRROR": "default"}
+    )
+
+# Alias yang dipakai untuk baca oleh view daftar/detail (api.routing)
+DATABASE_READ_ALIASES = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["api.routing.PrimaryReplicaRouter"]
+# Setelah menulis, klien membaca dari primary selama ini (detik)
+READ_AFTER_WRITE_SECONDS = 5
+READ_REPLICA_CACHE_ALIAS = "default"
+
+# View async untuk jalur baca utama; diaktifkan otomatis oleh review/asgi.py
+ASYNC_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "0") == "1"
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Alias cache untuk response API dan versi data (bisa diarahkan ke Redis/Memcached)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = 300
+
+# Cache token autentikasi: LRU per proses, opsional dilapis cache bersama
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TIMEOUT = 60
+TOKEN_CACHE_ALIAS = None
+
+# Interval cek versi cache data referensi (StatusModel, Category) antar proses (detik)
+REFERENCE_CACHE_CHECK_INTERVAL = 1
+
+# Umur maksimal indeks autocomplete per proses sebelum dibangun ulang (detik)
+AUTOCOMPLETE_MAX_AGE = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -114,17 +189,48 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
-    "DEFAULT_PAGINATION_CLASS": [
-        "rest_framework.pagination.LimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "api.paginators.CostumPagination",
+    # JSON cepat dengan orjson bila terpasang (pip install orjson), selain itu stdlib
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ],
     "DEFAULT_FILTER_BACKENDS": [
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
+    # Token bucket login/registrasi (api.throttling)
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": "20/min",
+        "login_username": "5/min",
+        "register_ip": "5/hour",
+    },
+    # Di belakang reverse proxy, jumlah proxy untuk membaca X-Forwarded-For
+    "NUM_PROXIES": None,
+}
+
+# Cache bersama untuk bucket throttling, arahkan ke Redis/Memcached di produksi
+THROTTLE_CACHE_ALIAS = "default"
+# Maksimal hashing password bersamaan per proses dan lama menunggu slot (detik)
+PASSWORD_HASHING_CONCURRENCY = 2
+PASSWORD_HASHING_TIMEOUT = 2
+
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "loggers": {
+        "api.metrics": {"level": "INFO" if API_METRICS_LOG else "WARNING"},
+    },
 }
 
 
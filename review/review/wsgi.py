@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'review.settings')
 
 application = get_wsgi_application()
+
+from review_app import autocomplete  # noqa: E402
+
+autocomplete.warm()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from review_app.models import User, StatusModel, FoodPlace, Category, FoodItem, FoodReview
+from review_app.models import User, StatusModel, FoodPlace, Category, FoodItem, FoodReview, ImageJob, CodeCounter, SearchEntry
 
 admin.site.register(User)
 admin.site.register(StatusModel)
@@ -7,3 +7,6 @@ admin.site.register(FoodPlace)
 admin.site.register(Category)
 admin.site.register(FoodItem)
 admin.site.register(FoodReview)
+admin.site.register(ImageJob)
+admin.site.register(CodeCounter)
+admin.site.register(SearchEntry)
@@ -0,0 +1,212 @@
+import heapq
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+FOOD = 'food'
+PLACE = 'place'
+CATEGORY = 'category'
+KINDS = (FOOD, PLACE, CATEGORY)
+
+# Rentang prefix lebih besar dari ini hasilnya disimpan sampai indeks berubah
+SCAN_LIMIT = 256
+MEMO_SIZE = 1024
+END = '\U0010ffff'
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.lower().split())
+
+
+def name_keys(name):
+    """Key prefix untuk tiap awal kata: "Nasi Goreng" -> "nasi goreng", "goreng"."""
+    words = normalize(name).split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+
+class Entry:
+    __slots__ = ('name', 'popularity', 'keys', 'category_id')
+
+    def __init__(self, name, popularity, keys, category_id=None):
+        self.name = name
+        self.popularity = popularity
+        self.keys = keys
+        self.category_id = category_id
+
+
+class PrefixIndex:
+    """
+    Array terurut ``(key, kind, id)`` yang dicari dengan ``bisect``; popularitas
+    (jumlah review) disimpan per objek sehingga bisa berubah tanpa mengurutkan
+    ulang. Popularitas kategori adalah total review makanan di dalamnya.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []
+        self._entries = {}
+        self._memo = {}
+        self.built_at = None
+
+    @property
+    def built(self):
+        return self.built_at is not None
+
+    def load(self, foods, places, categories):
+        """``foods``: ``(id, name, review_count, category_id)``, lainnya ``(id, name[, review_count])``."""
+        entries = {}
+        category_popularity = {}
+        for pk, name, popularity, category_id in foods:
+            entries[(FOOD, pk)] = Entry(name, popularity, name_keys(name), category_id)
+            if category_id is not None:
+                category_popularity[category_id] = category_popularity.get(category_id, 0) + popularity
+        for pk, name, popularity in places:
+            entries[(PLACE, pk)] = Entry(name, popularity, name_keys(name))
+        for pk, name in categories:
+            entries[(CATEGORY, pk)] = Entry(name, category_popularity.get(pk, 0), name_keys(name))
+        keys = sorted((key, kind, pk) for (kind, pk), entry in entries.items() for key in entry.keys)
+        with self._lock:
+            self._entries = entries
+            self._keys = keys
+            self._memo = {}
+            self.built_at = time.monotonic()
+
+    def put(self, kind, pk, name, category_id=None):
+        with self._lock:
+            entry = self._entries.get((kind, pk))
+            keys = name_keys(name)
+            if entry is None:
+                entry = self._entries[(kind, pk)] = Entry(name, 0, set(), category_id)
+            elif kind == FOOD and entry.category_id != category_id:
+                self._adjust(CATEGORY, entry.category_id, -entry.popularity)
+                self._adjust(CATEGORY, category_id, entry.popularity)
+            for key in entry.keys - keys:
+                self._remove_key(key, kind, pk)
+            for key in keys - entry.keys:
+                self._keys.insert(bisect_left(self._keys, (key, kind, pk)), (key, kind, pk))
+            entry.name = name
+            entry.keys = keys
+            entry.category_id = category_id
+            self._memo = {}
+
+    def remove(self, kind, pk):
+        with self._lock:
+            entry = self._entries.pop((kind, pk), None)
+            if entry is None:
+                return
+            for key in entry.keys:
+                self._remove_key(key, kind, pk)
+            if kind == FOOD:
+                self._adjust(CATEGORY, entry.category_id, -entry.popularity)
+            self._memo = {}
+
+    def adjust(self, kind, pk, delta):
+        with self._lock:
+            entry = self._entries.get((kind, pk))
+            if entry is None:
+                return
+            self._adjust(kind, pk, delta)
+            if kind == FOOD:
+                self._adjust(CATEGORY, entry.category_id, delta)
+            self._memo = {}
+
+    def _adjust(self, kind, pk, delta):
+        entry = self._entries.get((kind, pk))
+        if entry is not None:
+            entry.popularity = max(0, entry.popularity + delta)
+
+    def _remove_key(self, key, kind, pk):
+        i = bisect_left(self._keys, (key, kind, pk))
+        if i < len(self._keys) and self._keys[i] == (key, kind, pk):
+            del self._keys[i]
+
+    def lookup(self, prefix, limit=10, kinds=None):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        memo_key = (prefix, limit, tuple(kinds or ()))
+        with self._lock:
+            cached = self._memo.get(memo_key)
+            if cached is not None:
+                return cached
+            lo = bisect_left(self._keys, (prefix,))
+            hi = bisect_left(self._keys, (prefix + END,), lo)
+            refs = {(kind, pk) for _, kind, pk in self._keys[lo:hi] if not kinds or kind in kinds}
+            entries = self._entries
+            best = heapq.nsmallest(
+                limit, refs, key=lambda ref: (-entries[ref].popularity, entries[ref].name, ref)
+            )
+            result = [
+                {'kind': kind, 'id': pk, 'name': entries[(kind, pk)].name, 'popularity': entries[(kind, pk)].popularity}
+                for kind, pk in best
+            ]
+            if hi - lo > SCAN_LIMIT:
+                if len(self._memo) >= MEMO_SIZE:
+                    self._memo = {}
+                self._memo[memo_key] = result
+        return result
+
+
+index = PrefixIndex()
+_build_lock = threading.Lock()
+
+
+def build():
+    from review_app.models import Category, FoodItem, FoodPlace
+
+    index.load(
+        FoodItem.objects.values_list('id', 'name', 'review_count', 'category_id').iterator(),
+        FoodPlace.objects.values_list('id', 'name', 'review_count').iterator(),
+        Category.objects.values_list('id', 'name').iterator(),
+    )
+
+
+def get_index():
+    """
+    Indeks siap pakai. Dibangun saat pertama dipakai dan dibangun ulang setelah
+    ``AUTOCOMPLETE_MAX_AGE`` detik untuk menangkap perubahan dari proses lain;
+    perubahan di proses ini langsung diterapkan lewat sinyal.
+    """
+    max_age = getattr(settings, 'AUTOCOMPLETE_MAX_AGE', 300)
+    if index.built and time.monotonic() - index.built_at < max_age:
+        return index
+    # Hanya satu thread yang membangun, thread lain memakai indeks lama bila ada
+    if _build_lock.acquire(blocking=not index.built):
+        try:
+            if not index.built or time.monotonic() - index.built_at >= max_age:
+                build()
+        finally:
+            _build_lock.release()
+    return index
+
+
+def warm():
+    """Bangun indeks saat server start (wsgi/asgi); database belum siap bukan error."""
+    try:
+        get_index()
+    except DatabaseError:
+        pass
+
+
+def _after_commit(func, *args):
+    # Perubahan yang di-rollback tidak boleh masuk ke indeks
+    if index.built:
+        transaction.on_commit(lambda: func(*args))
+
+
+def object_saved(kind, instance):
+    _after_commit(index.put, kind, instance.pk, instance.name, getattr(instance, 'category_id', None))
+
+
+def object_deleted(kind, instance):
+    _after_commit(index.remove, kind, instance.pk)
+
+
+def popularity_changed(kind, pk, delta):
+    _after_commit(index.adjust, kind, pk, delta)
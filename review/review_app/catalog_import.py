@@ -0,0 +1,222 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from review_app import geo
+from review_app.models import (
+    Category, FoodItem, FoodPlace, StatusModel, allocate_food_codes,
+)
+from review_app.signals import bulk_imported
+
+FORMATS = ('csv', 'ndjson')
+
+
+def detect_format(filename, default=None):
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    return default
+
+
+INVALID_UTF8 = 'Teks bukan UTF-8 yang valid.'
+CSV_STOPPED = ' Sisa file tidak dibaca.'
+
+
+def read_rows(fileobj, fmt):
+    """
+    Baca baris CSV/NDJSON (file biner) secara bertahap; tiap baris dict atau error.
+
+    Baris NDJSON dibaca sendiri-sendiri, jadi baris yang bukan UTF-8 hanya
+    menggagalkan baris itu. Pada CSV, teks yang bukan UTF-8 atau CSV yang rusak
+    menjadi error di baris tempat pembacaan berhenti: batas baris sesudahnya
+    tidak bisa dipercaya.
+    """
+    if fmt == 'csv':
+        yield from _read_csv(fileobj)
+        return
+    for number, raw in enumerate(fileobj):
+        try:
+            line = raw.decode('utf-8-sig' if number == 0 else 'utf-8').strip()
+        except UnicodeDecodeError:
+            yield ValidationError(INVALID_UTF8)
+            continue
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield ValidationError(f'JSON tidak valid: {exc}')
+            continue
+        yield row if isinstance(row, dict) else ValidationError('Baris harus berupa objek JSON.')
+
+
+def _read_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.DictReader(text)
+    except UnicodeDecodeError:
+        yield ValidationError(INVALID_UTF8 + CSV_STOPPED)
+    except csv.Error as exc:
+        yield ValidationError(f'CSV tidak valid: {exc}.' + CSV_STOPPED)
+
+
+def _lookup_values(batch, key):
+    return {str(row.get(key)).strip() for _, row in batch if isinstance(row, dict) and row.get(key) not in (None, '')}
+
+
+def _resolve(model, values, label):
+    """Petakan id atau nama ke objek dalam satu query per jenis referensi."""
+    ids = {int(value) for value in values if value.isdigit()}
+    names = {value for value in values if not value.isdigit()}
+    found = {}
+    if ids:
+        found.update({str(obj.pk): obj for obj in model.objects.filter(pk__in=ids)})
+    if names:
+        by_name = {}
+        for obj in model.objects.filter(name__in=names):
+            by_name.setdefault(obj.name, []).append(obj)
+        for name, objs in by_name.items():
+            found[name] = objs[0] if len(objs) == 1 else ValidationError(
+                f'{label} "{name}" tidak unik, gunakan id.'
+            )
+    return found
+
+
+class BulkImporter:
+    model = None
+    references = {}
+    exclude = ()
+    batch_size = 500
+
+    def __init__(self, user=None, batch_size=None):
+        self.user = user
+        if batch_size:
+            self.batch_size = batch_size
+
+    def run(self, rows):
+        created = 0
+        errors = []
+        numbered = enumerate(rows, start=1)
+        while True:
+            batch = list(islice(numbered, self.batch_size))
+            if not batch:
+                break
+            refs = {
+                key: _resolve(model, _lookup_values(batch, key), label)
+                for key, (model, label) in self.references.items()
+            }
+            objs = []
+            for row_no, row in batch:
+                try:
+                    if isinstance(row, ValidationError):
+                        raise row
+                    objs.append(self.build(row, refs))
+                except ValidationError as exc:
+                    errors.append({'row': row_no, 'errors': self.error_detail(exc)})
+            if objs:
+                with transaction.atomic():
+                    self.before_insert(objs)
+                    self.model.objects.bulk_create(objs, batch_size=self.batch_size)
+                bulk_imported.send(sender=self.model, instances=objs)
+                created += len(objs)
+        return {'created': created, 'failed': len(errors), 'errors': errors}
+
+    def error_detail(self, exc):
+        if hasattr(exc, 'error_dict'):
+            return {field: [str(m) for m in messages] for field, messages in exc.message_dict.items()}
+        return {'non_field_errors': exc.messages}
+
+    def reference(self, row, refs, key, required=True):
+        value = row.get(key)
+        if value in (None, ''):
+            if required:
+                raise ValidationError({key: 'Wajib diisi.'})
+            return None
+        obj = refs[key].get(str(value).strip())
+        if obj is None:
+            raise ValidationError({key: f'"{value}" tidak ditemukan.'})
+        if isinstance(obj, ValidationError):
+            raise ValidationError({key: obj.messages})
+        return obj
+
+    def build(self, row, refs):
+        raise NotImplementedError
+
+    def before_insert(self, objs):
+        pass
+
+
+class FoodPlaceImporter(BulkImporter):
+    model = FoodPlace
+    references = {'status': (StatusModel, 'Status')}
+    fields = ('name', 'description', 'latitude', 'longitude', 'address')
+    exclude = ('status', 'user_create', 'user_update', 'geo_cell')
+
+    def build(self, row, refs):
+        place = FoodPlace(**{field: row.get(field) for field in self.fields})
+        if place.description == '':
+            place.description = None
+        errors = {}
+        try:
+            place.status = self.reference(row, refs, 'status')
+        except ValidationError as exc:
+            errors.update(exc.message_dict)
+        try:
+            place.clean_fields(exclude=self.exclude)
+        except ValidationError as exc:
+            errors.update(exc.message_dict)
+        if not errors:
+            if not -90 <= place.latitude <= 90:
+                errors['latitude'] = ['Harus di antara -90 dan 90.']
+            if not -180 <= place.longitude <= 180:
+                errors['longitude'] = ['Harus di antara -180 dan 180.']
+        if errors:
+            raise ValidationError(errors)
+        place.geo_cell = geo.cell_for(place.latitude, place.longitude)
+        place.user_create = self.user
+        return place
+
+
+class FoodItemImporter(BulkImporter):
+    model = FoodItem
+    references = {
+        'place': (FoodPlace, 'Tempat makan'),
+        'category': (Category, 'Kategori'),
+        'status': (StatusModel, 'Status'),
+    }
+    fields = ('name', 'price', 'description')
+    exclude = ('code', 'place', 'category', 'status', 'image', 'user_create', 'user_update')
+
+    def build(self, row, refs):
+        food = FoodItem(**{field: row.get(field) for field in self.fields})
+        errors = {}
+        for key, required in (('place', True), ('category', False), ('status', True)):
+            try:
+                setattr(food, key, self.reference(row, refs, key, required))
+            except ValidationError as exc:
+                errors.update(exc.message_dict)
+        try:
+            food.clean_fields(exclude=self.exclude)
+        except ValidationError as exc:
+            errors.update(exc.message_dict)
+        if errors:
+            raise ValidationError(errors)
+        food.user_create = self.user
+        return food
+
+    def before_insert(self, objs):
+        # Satu reservasi blok kode untuk seluruh chunk
+        for food, code in zip(objs, allocate_food_codes(len(objs))):
+            food.code = code
+
+
+IMPORTERS = {
+    'places': FoodPlaceImporter,
+    'foods': FoodItemImporter,
+}
@@ -0,0 +1,74 @@
+import math
+
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Ukuran sel grid dalam derajat (~11 km di khatulistiwa)
+CELL_SIZE_DEG = 0.1
+CELL_ROWS = int(round(180 / CELL_SIZE_DEG))
+CELL_COLS = int(round(360 / CELL_SIZE_DEG))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _cell_row(lat):
+    return min(CELL_ROWS - 1, max(0, int(math.floor((lat + 90) / CELL_SIZE_DEG))))
+
+
+def _cell_col(lon):
+    return int(math.floor((lon + 180) / CELL_SIZE_DEG)) % CELL_COLS
+
+
+def cell_for(lat, lon):
+    if lat is None or lon is None:
+        return None
+    return _cell_row(lat) * CELL_COLS + _cell_col(lon)
+
+
+def bounding_box(lat, lon, radius_km):
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(-90.0, lat - dlat)
+    max_lat = min(90.0, lat + dlat)
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        # Kotak menyentuh kutub, semua bujur ikut terjangkau
+        return min_lat, max_lat, -180.0, 180.0
+    dlon = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))))
+    )
+    return min_lat, max_lat, lon - dlon, lon + dlon
+
+
+def cell_ranges(min_lat, max_lat, min_lon, max_lon):
+    """Rentang ``(awal, akhir)`` nomor sel yang menutupi bounding box."""
+    if max_lon - min_lon >= 360:
+        cols = [(0, CELL_COLS - 1)]
+    else:
+        first, last = _cell_col(min_lon), _cell_col(max_lon)
+        if first <= last:
+            cols = [(first, last)]
+        else:
+            # Melewati garis bujur 180
+            cols = [(first, CELL_COLS - 1), (0, last)]
+    ranges = []
+    for row in range(_cell_row(min_lat), _cell_row(max_lat) + 1):
+        base = row * CELL_COLS
+        ranges.extend((base + start, base + end) for start, end in cols)
+    return ranges
+
+
+def nearby_filter(lat, lon, radius_km):
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    cells = Q()
+    for start, end in cell_ranges(min_lat, max_lat, min_lon, max_lon):
+        cells |= Q(geo_cell__range=(start, end))
+    box = Q(latitude__range=(min_lat, max_lat))
+    if min_lon >= -180 and max_lon <= 180:
+        box &= Q(longitude__range=(min_lon, max_lon))
+    return cells & box
@@ -0,0 +1,99 @@
+import os
+from datetime import timedelta
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+
+from review_app.images import RENDITION_FORMATS, ImageLimitError, image_filename
+from review_app.models import FoodItem, ImageJob
+from review_app.versions import bump_version
+
+MAX_ATTEMPTS = 3
+STALE_TIMEOUT = timedelta(minutes=10)
+
+
+def claim_jobs(limit):
+    claimed_ids = []
+    pending = ImageJob.objects.filter(status=ImageJob.PENDING).order_by('id')
+    for job_id in pending.values_list('id', flat=True)[:limit]:
+        # Update bersyarat: hanya satu worker yang berhasil mengambil job
+        taken = ImageJob.objects.filter(pk=job_id, status=ImageJob.PENDING).update(
+            status=ImageJob.RUNNING, attempts=F('attempts') + 1, updated_at=timezone.now()
+        )
+        if taken:
+            claimed_ids.append(job_id)
+    if not claimed_ids:
+        return []
+    return list(ImageJob.objects.filter(pk__in=claimed_ids).order_by('id'))
+
+
+def requeue_stale_jobs(timeout):
+    return ImageJob.objects.filter(
+        status=ImageJob.RUNNING, updated_at__lt=timezone.now() - timeout
+    ).update(status=ImageJob.PENDING, updated_at=timezone.now())
+
+
+def prepare_source(job, work_dir):
+    """Path lokal file sumber; disalin bertahap jika storage bukan filesystem."""
+    try:
+        return default_storage.path(job.source)
+    except NotImplementedError:
+        pass
+    path = os.path.join(work_dir, 'source')
+    with default_storage.open(job.source, 'rb') as src, open(path, 'wb') as dst:
+        for chunk in src.chunks():
+            dst.write(chunk)
+    return path
+
+
+def _store(path, name):
+    with open(path, 'rb') as f:
+        return default_storage.save(name, File(f, name=os.path.basename(name)))
+
+
+def finish_job(job, result):
+    full, renditions = result
+    image_field = FoodItem._meta.get_field('image')
+    name = _store(full, image_field.generate_filename(None, image_filename('food')))
+    saved = [name]
+    rendition_names = {}
+    for (size, fmt), path in renditions.items():
+        ext = RENDITION_FORMATS[fmt][0]
+        rendition_name = _store(
+            path, image_field.generate_filename(None, image_filename('food', f'-{size}', ext))
+        )
+        saved.append(rendition_name)
+        rendition_names.setdefault(str(size), {})[fmt] = rendition_name
+    # Tukar file hanya jika gambar item belum diganti sejak job dibuat
+    swapped = FoodItem.objects.filter(pk=job.food_id, image=job.source).update(
+        image=name,
+        image_renditions=rendition_names,
+        image_status=FoodItem.IMAGE_READY,
+        last_modified=timezone.now(),
+    )
+    if swapped:
+        bump_version(FoodItem)
+        default_storage.delete(job.source)
+    else:
+        for saved_name in saved:
+            default_storage.delete(saved_name)
+    ImageJob.objects.filter(pk=job.pk).update(status=ImageJob.DONE, error='', updated_at=timezone.now())
+
+
+def fail_job(job, error):
+    # Gambar yang melewati batas tidak akan berhasil walau diulang
+    if job.attempts < MAX_ATTEMPTS and not isinstance(error, ImageLimitError):
+        ImageJob.objects.filter(pk=job.pk).update(
+            status=ImageJob.PENDING, error=str(error), updated_at=timezone.now()
+        )
+        return
+    ImageJob.objects.filter(pk=job.pk).update(
+        status=ImageJob.FAILED, error=str(error), updated_at=timezone.now()
+    )
+    if FoodItem.objects.filter(pk=job.food_id, image=job.source).update(
+        image_status=FoodItem.IMAGE_FAILED
+    ):
+        bump_version(FoodItem)
+
@@ -0,0 +1,87 @@
+import os
+from datetime import datetime
+
+from PIL import Image
+
+# Batas sebelum gambar didekode, agar satu upload tidak menghabiskan memori worker
+MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+MAX_IMAGE_PIXELS = 50_000_000
+# Sisi terpanjang gambar utama yang disimpan
+MAX_IMAGE_EDGE = 2048
+
+# Lebar sisi terpanjang (px) dan format rendisi yang dibuat untuk tiap gambar
+RENDITION_SIZES = (160, 480, 1080)
+RENDITION_FORMATS = {
+    'jpeg': ('jpg', {'quality': 70, 'optimize': True, 'progressive': True}),
+    'webp': ('webp', {'quality': 70, 'method': 4}),
+}
+
+
+class ImageLimitError(ValueError):
+    pass
+
+
+def check_image_limits(fp, size_bytes):
+    """Periksa ukuran file dan jumlah piksel dari header saja, tanpa dekode."""
+    if size_bytes > MAX_UPLOAD_BYTES:
+        raise ImageLimitError(
+            f'Ukuran file maksimal {MAX_UPLOAD_BYTES // (1024 * 1024)} MB.'
+        )
+    im = Image.open(fp)
+    width, height = im.size
+    if width * height > MAX_IMAGE_PIXELS:
+        raise ImageLimitError(
+            f'Resolusi gambar maksimal {MAX_IMAGE_PIXELS // 1_000_000} megapiksel.'
+        )
+    return im
+
+
+def open_scaled(path, max_edge):
+    """
+    Dekode gambar langsung ke skala yang dibutuhkan.
+
+    JPEG memakai draft mode (DCT scaling 1/2, 1/4, 1/8) sehingga piksel penuh
+    tidak pernah dialokasikan; format lain diperkecil dengan ``reduce``
+    sebelum resampling akhir.
+    """
+    im = check_image_limits(path, os.path.getsize(path))
+    width, height = im.size
+    scale = min(1.0, max_edge / max(width, height))
+    target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    if im.format == 'JPEG':
+        im.draft('RGB', target)
+    factor = min(im.size[0] // target[0], im.size[1] // target[1])
+    if factor >= 2:
+        im = im.reduce(factor)
+    if im.mode != 'RGB':
+        im = im.convert('RGB')
+    if im.size != target:
+        im = im.resize(target, Image.LANCZOS)
+    return im
+
+
+def render_image(path, out_dir):
+    """
+    Buat gambar utama dan rendisi tiap ukuran dalam JPEG dan WebP.
+
+    Semua hasil ditulis ke file di ``out_dir``; yang dikembalikan hanya
+    path-nya: ``(utama, {(ukuran, format): path})``.
+    """
+    im = open_scaled(path, MAX_IMAGE_EDGE)
+    full = os.path.join(out_dir, 'full.jpg')
+    im.save(full, 'jpeg', quality=50, optimize=True)
+    renditions = {}
+    for size in sorted(RENDITION_SIZES, reverse=True):
+        # Perkecil bertahap dari rendisi sebelumnya, lebih murah dari gambar asli
+        im = im.copy()
+        im.thumbnail((size, size), Image.LANCZOS)
+        for fmt, (ext, options) in RENDITION_FORMATS.items():
+            out = os.path.join(out_dir, f'{size}.{ext}')
+            im.save(out, fmt, **options)
+            renditions[(size, fmt)] = out
+    return full, renditions
+
+
+def image_filename(prefix, suffix='', ext='jpg'):
+    curr_datetime = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return f'{prefix}-{curr_datetime}{suffix}.{ext}'
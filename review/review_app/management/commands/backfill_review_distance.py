@@ -0,0 +1,74 @@
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from review_app.geo import EARTH_RADIUS_KM
+from review_app.models import FoodReview
+from review_app.versions import bump_version
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Hitung ulang distance_km review dari koordinat reviewer dan tempat makan. "
+        "Review lama (sebelum koordinat reviewer disimpan) tidak punya koordinat dan "
+        "tidak ada sumber lain untuknya: review tersebut dilewati, distance_km-nya "
+        "tetap nilai kiriman klien, dan jumlahnya dilaporkan di akhir."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        table = connection.ops.quote_name(FoodReview._meta.db_table)
+        sql = f"UPDATE {table} SET distance_km = %s WHERE id = %s"
+
+        rows = FoodReview.objects.filter(
+            reviewer_latitude__isnull=False, reviewer_longitude__isnull=False
+        ).order_by("id")
+        last_id = 0
+        total = 0
+        while True:
+            chunk = list(
+                rows.filter(id__gt=last_id).values_list(
+                    "id",
+                    "reviewer_latitude",
+                    "reviewer_longitude",
+                    "food__place__latitude",
+                    "food__place__longitude",
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+            ids = [row[0] for row in chunk]
+            coords = np.array([row[1:] for row in chunk], dtype=np.float64)
+            distances = haversine_km(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.executemany(sql, zip(distances.tolist(), ids))
+            last_id = ids[-1]
+            total += len(chunk)
+            self.stdout.write(f"{total} review diperbarui...")
+
+        # UPDATE mentah tidak mengirim signal: response cache review harus dibuang manual
+        if total:
+            bump_version(FoodReview)
+        self.stdout.write(self.style.SUCCESS(f"Selesai, {total} review diperbarui."))
+        legacy = FoodReview.objects.filter(
+            Q(reviewer_latitude__isnull=True) | Q(reviewer_longitude__isnull=True)
+        ).count()
+        if legacy:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{legacy} review tanpa koordinat reviewer dilewati; distance_km tidak diubah."
+                )
+            )
@@ -0,0 +1,101 @@
+import multiprocessing
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image
+
+from review_app.images import render_image
+
+
+def _status_kb(key):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(key + ":"):
+                return int(line.split()[1])
+    raise KeyError(key)
+
+
+def _reset_peak_rss():
+    """Reset puncak RSS (Linux); nilai awal dipakai sebagai baseline pengukuran."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return _status_kb("VmRSS"), lambda: _status_kb("VmHWM")
+    except OSError:
+        peak = lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak(), peak
+
+
+def legacy_compress(path, out_dir):
+    # Jalur lama: dekode penuh, konversi RGB ukuran asli, encode ke BytesIO
+    im = Image.open(path)
+    if im.mode != 'RGB':
+        im = im.convert('RGB')
+    im_io = BytesIO()
+    im.save(im_io, 'jpeg', quality=50, optimize=True)
+    return im_io.getvalue()
+
+
+def measure(func_name, path, out_dir):
+    func = {'legacy': legacy_compress, 'bounded': render_image}[func_name]
+    before, peak = _reset_peak_rss()
+    start = time.perf_counter()
+    func(path, out_dir)
+    elapsed = time.perf_counter() - start
+    return peak() - before, elapsed
+
+
+class Command(BaseCommand):
+    help = "Bandingkan puncak memori (RSS) dekode gambar lama dan baru pada media/food_images."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--edge",
+            type=int,
+            default=6000,
+            help="Perbesar contoh gambar ke sisi terpanjang ini (0 = ukuran asli).",
+        )
+        parser.add_argument("--limit", type=int, default=5)
+
+    def handle(self, *args, **options):
+        samples = sorted(Path(settings.MEDIA_ROOT, "food_images").glob("*.jpg"))
+        samples = samples[: options["limit"]]
+        work_dir = tempfile.mkdtemp(prefix="bench-image-")
+        # Proses baru untuk tiap pengukuran agar puncak RSS tidak terbawa
+        context = multiprocessing.get_context("spawn")
+        try:
+            self.stdout.write(f"{'gambar':<32}{'piksel':>12}{'lama MB':>10}{'baru MB':>10}{'lama ms':>10}{'baru ms':>10}")
+            for sample in samples:
+                path = self.prepare(sample, work_dir, options["edge"])
+                with Image.open(path) as im:
+                    pixels = im.size[0] * im.size[1]
+                results = []
+                for name in ("legacy", "bounded"):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        results.append(pool.submit(measure, name, path, work_dir).result())
+                (old_kb, old_s), (new_kb, new_s) = results
+                self.stdout.write(
+                    f"{sample.name:<32}{pixels:>12}{old_kb / 1024:>10.1f}{new_kb / 1024:>10.1f}"
+                    f"{old_s * 1000:>10.1f}{new_s * 1000:>10.1f}"
+                )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def prepare(self, sample, work_dir, edge):
+        if not edge:
+            return str(sample)
+        with Image.open(sample) as im:
+            scale = edge / max(im.size)
+            big = im.convert("RGB").resize(
+                (round(im.size[0] * scale), round(im.size[1] * scale)), Image.BICUBIC
+            )
+        path = str(Path(work_dir, f"big-{sample.name}"))
+        big.save(path, "jpeg", quality=90)
+        return path
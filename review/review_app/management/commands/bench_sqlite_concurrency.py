@@ -0,0 +1,165 @@
+import multiprocessing
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from review_app.sqlite import apply_pragmas
+
+# Skema ringkas dengan bentuk query yang sama seperti POST/GET /api/reviews/
+SCHEMA = (
+    "CREATE TABLE food (id INTEGER PRIMARY KEY, name TEXT, review_count INTEGER, rating_sum INTEGER)",
+    "CREATE TABLE review (id INTEGER PRIMARY KEY, food_id INTEGER, rating INTEGER, comment TEXT, created_at REAL)",
+    "CREATE INDEX review_created ON review (created_at, id)",
+)
+FOODS = 200
+
+
+def prepare(path, rows):
+    conn = sqlite3.connect(path)
+    for sql in SCHEMA:
+        conn.execute(sql)
+    conn.executemany("INSERT INTO food VALUES (?, ?, 0, 0)", [(i, f"food {i}") for i in range(1, FOODS + 1)])
+    now = time.time()
+    conn.executemany(
+        "INSERT INTO review (food_id, rating, comment, created_at) VALUES (?, ?, ?, ?)",
+        [(random.randint(1, FOODS), random.randint(1, 5), "enak " * 20, now - i) for i in range(rows)],
+    )
+    conn.commit()
+    conn.close()
+
+
+class Client:
+    """
+    ``development``: koneksi baru per operasi (CONN_MAX_AGE=0), journal bawaan,
+    BEGIN deferred. ``production``: koneksi persisten, pragma produksi,
+    BEGIN IMMEDIATE.
+    """
+
+    def __init__(self, path, profile, pragmas):
+        self.path = path
+        self.production = profile == "production"
+        self.pragmas = pragmas
+        self.conn = self.connect() if self.production else None
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        if self.production:
+            apply_pragmas(conn.cursor(), self.pragmas)
+        return conn
+
+    def run(self, func):
+        conn = self.conn or self.connect()
+        try:
+            return func(conn)
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+    def write(self, conn):
+        conn.execute("BEGIN IMMEDIATE" if self.production else "BEGIN")
+        try:
+            food = random.randint(1, FOODS)
+            rating = random.randint(1, 5)
+            conn.execute(
+                "INSERT INTO review (food_id, rating, comment, created_at) VALUES (?, ?, ?, ?)",
+                (food, rating, "mantap " * 10, time.time()),
+            )
+            conn.execute(
+                "UPDATE food SET review_count = review_count + 1, rating_sum = rating_sum + ? WHERE id = ?",
+                (rating, food),
+            )
+            conn.execute("COMMIT")
+        except sqlite3.OperationalError:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+    def read(self, conn):
+        return conn.execute(
+            "SELECT r.id, r.rating, r.comment, f.name FROM review r JOIN food f ON f.id = r.food_id "
+            "ORDER BY r.created_at DESC, r.id DESC LIMIT 20"
+        ).fetchall()
+
+
+def worker(path, profile, pragmas, role, start_at, seconds):
+    client = Client(path, profile, pragmas)
+    op = client.write if role == "write" else client.read
+    done = errors = 0
+    latencies = []
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        began = time.perf_counter()
+        try:
+            client.run(op)
+            done += 1
+            latencies.append(time.perf_counter() - began)
+        except sqlite3.OperationalError:
+            # "database is locked" setelah busy timeout habis
+            errors += 1
+    return role, done, errors, latencies
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Bandingkan throughput baca/tulis SQLite dengan penulis paralel: profil "
+        "development (default) dan production (WAL, pragma, koneksi persisten)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5)
+        parser.add_argument("--rows", type=int, default=20000, help="Jumlah review awal.")
+
+    def handle(self, *args, **options):
+        pragmas = settings.SQLITE_PRODUCTION_PRAGMAS
+        work_dir = tempfile.mkdtemp(prefix="bench-sqlite-")
+        context = multiprocessing.get_context("spawn")
+        roles = ["write"] * options["writers"] + ["read"] * options["readers"]
+        try:
+            self.stdout.write(
+                f"{'profil':<12}{'tulis/s':>10}{'baca/s':>10}{'locked':>8}{'tulis p99 ms':>14}{'baca p99 ms':>13}"
+            )
+            for profile in ("development", "production"):
+                path = str(Path(work_dir, f"{profile}.sqlite3"))
+                prepare(path, options["rows"])
+                with ProcessPoolExecutor(max_workers=len(roles), mp_context=context) as pool:
+                    # Proses diberi waktu start yang sama setelah semuanya siap
+                    start_at = time.time() + 2
+                    futures = [
+                        pool.submit(worker, path, profile, pragmas, role, start_at, options["seconds"])
+                        for role in roles
+                    ]
+                    results = [future.result() for future in futures]
+                totals = {"write": [0, 0, []], "read": [0, 0, []]}
+                for role, done, errors, latencies in results:
+                    totals[role][0] += done
+                    totals[role][1] += errors
+                    totals[role][2].extend(latencies)
+                seconds = options["seconds"]
+                self.stdout.write(
+                    f"{profile:<12}"
+                    f"{totals['write'][0] / seconds:>10.0f}"
+                    f"{totals['read'][0] / seconds:>10.0f}"
+                    f"{totals['write'][1] + totals['read'][1]:>8}"
+                    f"{percentile(totals['write'][2], 0.99) * 1000:>14.1f}"
+                    f"{percentile(totals['read'][2], 0.99) * 1000:>13.1f}"
+                )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
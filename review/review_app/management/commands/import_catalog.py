@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from review_app.catalog_import import FORMATS, IMPORTERS, detect_format, read_rows
+from review_app.models import User
+
+
+class Command(BaseCommand):
+    help = "Import tempat makan atau makanan secara massal dari file CSV/NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=FORMATS)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--user", help="Username yang dicatat sebagai user_create.")
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        if fmt is None:
+            raise CommandError("Format file tidak dikenali, gunakan --format.")
+        user = None
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} tidak ditemukan.")
+
+        importer = IMPORTERS[options["kind"]](user=user, batch_size=options["batch_size"])
+        with open(options["path"], "rb") as f:
+            result = importer.run(read_rows(f, fmt))
+
+        for error in result["errors"]:
+            self.stderr.write(json.dumps(error, ensure_ascii=False))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['created']} baris berhasil diimport, {result['failed']} gagal."
+            )
+        )
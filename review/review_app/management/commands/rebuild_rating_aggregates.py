@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from review_app.ratings import rebuild_rating_aggregates
+
+
+class Command(BaseCommand):
+    help = "Hitung ulang review_count, rating_sum dan rating_avg makanan dan tempat makan."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            changed = rebuild_rating_aggregates()
+        self.stdout.write(self.style.SUCCESS(
+            f"Agregat rating berhasil dihitung ulang: {changed['food']} makanan, "
+            f"{changed['place']} tempat makan berubah."
+        ))
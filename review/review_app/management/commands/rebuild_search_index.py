@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from review_app import search
+
+
+class Command(BaseCommand):
+    help = "Bangun ulang indeks pencarian teks (FTS5 bila tersedia) dari data makanan, tempat dan review."
+
+    def handle(self, *args, **options):
+        if search.create_fts(connection):
+            self.stdout.write("Memakai SQLite FTS5.")
+        else:
+            self.stdout.write("FTS5 tidak tersedia, pencarian memakai fallback icontains.")
+        counts = search.rebuild()
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count} dokumen")
+        self.stdout.write(self.style.SUCCESS("Indeks pencarian selesai dibangun ulang."))
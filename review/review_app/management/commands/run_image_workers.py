@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from review_app import image_jobs
+from review_app.images import render_image
+
+
+class Command(BaseCommand):
+    help = "Jalankan worker pemrosesan gambar makanan dari antrean ImageJob."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--poll-interval", type=float, default=2.0)
+        parser.add_argument(
+            "--once", action="store_true", help="Berhenti setelah antrean kosong."
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        requeued = image_jobs.requeue_stale_jobs(image_jobs.STALE_TIMEOUT)
+        if requeued:
+            self.stdout.write(f"{requeued} job macet dikembalikan ke antrean.")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                jobs = image_jobs.claim_jobs(workers * 2)
+                if not jobs:
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+                futures = []
+                for job in jobs:
+                    work_dir = tempfile.mkdtemp(prefix="image-job-")
+                    try:
+                        source = image_jobs.prepare_source(job, work_dir)
+                        futures.append((job, work_dir, pool.submit(render_image, source, work_dir)))
+                    except Exception as exc:
+                        shutil.rmtree(work_dir, ignore_errors=True)
+                        image_jobs.fail_job(job, exc)
+                for job, work_dir, future in futures:
+                    try:
+                        image_jobs.finish_job(job, future.result())
+                    except Exception as exc:
+                        image_jobs.fail_job(job, exc)
+                        self.stderr.write(f"Job {job.pk} gagal: {exc}")
+                    else:
+                        self.stdout.write(f"Job {job.pk} selesai.")
+                    finally:
+                        shutil.rmtree(work_dir, ignore_errors=True)
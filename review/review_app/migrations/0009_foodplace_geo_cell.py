@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:07
+
+from django.db import migrations, models
+
+from review_app.geo import cell_for
+
+
+def fill_geo_cell(apps, schema_editor):
+    FoodPlace = apps.get_model('review_app', 'FoodPlace')
+    places = list(FoodPlace.objects.only('id', 'latitude', 'longitude'))
+    for place in places:
+        place.geo_cell = cell_for(place.latitude, place.longitude)
+    FoodPlace.objects.bulk_update(places, ['geo_cell'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0008_foodreview_place_alter_statusmodel_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodplace',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_geo_cell, migrations.RunPython.noop),
+    ]
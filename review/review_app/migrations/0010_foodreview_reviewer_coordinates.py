@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0009_foodplace_geo_cell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='foodreview',
+            name='reviewer_latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='foodreview',
+            name='reviewer_longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:09
+
+from django.db import migrations, models
+
+
+def fill_rating_aggregates(apps, schema_editor):
+    from review_app.ratings import rebuild_rating_aggregates
+
+    rebuild_rating_aggregates(
+        apps.get_model('review_app', 'FoodItem'),
+        apps.get_model('review_app', 'FoodPlace'),
+        apps.get_model('review_app', 'FoodReview'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0010_foodreview_reviewer_coordinates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fooditem',
+            name='rating_avg',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='fooditem',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='fooditem',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='foodplace',
+            name='rating_avg',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='foodplace',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='foodplace',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_rating_aggregates, migrations.RunPython.noop),
+    ]
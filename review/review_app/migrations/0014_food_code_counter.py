@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:15
+
+import re
+
+from django.db import migrations, models
+
+
+def seed_food_code_counter(apps, schema_editor):
+    FoodItem = apps.get_model('review_app', 'FoodItem')
+    CodeCounter = apps.get_model('review_app', 'CodeCounter')
+    last = 0
+    for code in FoodItem.objects.values_list('code', flat=True).iterator():
+        match = re.search(r'(\d+)$', code or '')
+        if match:
+            last = max(last, int(match.group(1)))
+    CodeCounter.objects.update_or_create(name='food_code', defaults={'value': last})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0013_fooditem_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='fooditem',
+            name='code',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(seed_food_code_counter, migrations.RunPython.noop),
+    ]
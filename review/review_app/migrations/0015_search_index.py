@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+from review_app import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_fts(schema_editor.connection)
+    search.rebuild(apps, using=schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_fts(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0014_food_code_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('food', 'Makanan'), ('place', 'Tempat makan'), ('review', 'Review')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField(blank=True, default='')),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_entry_unique_object')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review_app', '0015_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['last_modified'], name='review_app__last_mo_4ef294_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['status', 'created_on', 'id'], name='review_app__status__635c0d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['status', 'price', 'id'], name='review_app__status__57c02b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['category', 'created_on', 'id'], name='review_app__categor_f9b07d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['created_on', 'id'], name='review_app__created_96322a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['price', 'id'], name='review_app__price_5a0910_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(fields=['last_modified'], name='review_app__last_mo_8c3244_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodplace',
+            index=models.Index(fields=['created_on', 'id'], name='review_app__created_ad7d45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodplace',
+            index=models.Index(fields=['updated_on'], name='review_app__updated_2251fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodreview',
+            index=models.Index(fields=['created_at', 'id'], name='review_app__created_e8152f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='foodreview',
+            index=models.Index(fields=['food', 'created_at', 'id'], name='review_app__food_id_97b75b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statusmodel',
+            index=models.Index(fields=['last_modified'], name='review_app__last_mo_fdfdae_idx'),
+        ),
+    ]
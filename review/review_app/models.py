@@ -1,10 +1,8 @@
-import sys
-from datetime import datetime
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import AbstractUser
-from PIL import Image
-from io import BytesIO
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.storage import default_storage
+from review_app import geo
 
 
 class User(AbstractUser):
@@ -28,15 +26,44 @@ class StatusModel(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # ETag list memakai status terakhir diubah
+        indexes = [models.Index(fields=['last_modified'])]
+
     def __str__(self):
         return self.name
     
 
-class FoodPlace(models.Model):
+class RatingSummary(models.Model):
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(default=0, editable=False)
+
+    rating_fields = ('review_count', 'rating_sum', 'rating_avg')
+    # Kolom waktu perubahan, ikut diperbarui saat agregat rating berubah
+    modified_field = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        # Agregat rating hanya diubah lewat update F(), jangan ditimpa nilai lama
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.rating_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class FoodPlace(RatingSummary):
+    modified_field = 'updated_on'
+
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     latitude = models.FloatField()
     longitude = models.FloatField()
+    geo_cell = models.IntegerField(blank=True, null=True, db_index=True, editable=False)
     address = models.CharField(max_length=255)
     status = models.ForeignKey(StatusModel, related_name="status_foodplace", on_delete=models.PROTECT)
     user_create = models.ForeignKey(User, related_name="user_create_foodplace", blank=True, null=True, on_delete=models.SET_NULL)
@@ -44,8 +71,22 @@ class FoodPlace(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Urutan daftar (keyset cursor) dan validator ETag
+            models.Index(fields=['created_on', 'id']),
+            models.Index(fields=['updated_on']),
+        ]
+
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.geo_cell = geo.cell_for(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geo_cell'}
+        super().save(*args, **kwargs)
     
 
 class Category(models.Model):
@@ -56,38 +97,69 @@ class Category(models.Model):
     create_on = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['last_modified'])]
+
     def __str__(self):
         return self.name
     
 
-def compress_image(image, filename):
-    curr_datetime = datetime.now().strftime('%Y%m%d %H%M%S')
-    im = Image.open(image)
-    if im.mode != 'RGB':
-        im = im.convert('RGB')
-    im_io = BytesIO()
-    im.save(im_io, 'jpeg', quality=50, optimize=True)
-    im.seek(0)
-    new_image = InMemoryUploadedFile(im_io, 'ImageField', f'{filename}-{curr_datetime}.jpg', 'image/jpeg', sys.getsizeof(im_io), None)
-    return new_image
+class CodeCounter(models.Model):
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+    @classmethod
+    def allocate(cls, name, count=1):
+        """Reservasi ``count`` nomor berurutan secara atomik, hasilnya ``range``."""
+        counter = cls.objects.filter(name=name)
+        with transaction.atomic():
+            if not counter.update(value=F('value') + count):
+                cls.objects.get_or_create(name=name)
+                counter.update(value=F('value') + count)
+            last = counter.values_list('value', flat=True).get()
+        return range(last - count + 1, last + 1)
+
+
+FOOD_CODE_COUNTER = 'food_code'
+FOOD_CODE_PREFIX = 'FD-'
+FOOD_CODE_WIDTH = 4
+
+
+def format_food_code(number):
+    return f'{FOOD_CODE_PREFIX}{number:0{FOOD_CODE_WIDTH}d}'
+
+
+def allocate_food_codes(count=1):
+    return [format_food_code(number) for number in CodeCounter.allocate(FOOD_CODE_COUNTER, count)]
+
 
 def increment_food_code():
-    last_code = FoodItem.objects.all().order_by('id').last()
-    if not last_code:
-        return 'FD-0001'
-    code = last_code.code
-    code_int = int(code[3:7])
-    new_code_int = code_int + 1
-    return 'FD-' + str(new_code_int).zfill(4)
+    # Masih direferensikan migrasi 0005; kode baru dialokasikan di FoodItem.save
+    return allocate_food_codes(1)[0]
+
 
+class FoodItem(RatingSummary):
+    IMAGE_READY = 'ready'
+    IMAGE_PROCESSING = 'processing'
+    IMAGE_FAILED = 'failed'
+    image_status_choices = (
+        (IMAGE_READY, 'Ready'),
+        (IMAGE_PROCESSING, 'Processing'),
+        (IMAGE_FAILED, 'Failed'),
+    )
+    modified_field = 'last_modified'
 
-class FoodItem(models.Model):
-    code = models.CharField(max_length=20, default=increment_food_code, editable=False)
+    code = models.CharField(max_length=20, blank=True, editable=False)
     place = models.ForeignKey(FoodPlace, related_name="foods", on_delete=models.CASCADE)
     name = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField()
     image = models.ImageField(upload_to='food_images/', blank=True, null=True)
+    image_status = models.CharField(max_length=10, choices=image_status_choices, default=IMAGE_READY, editable=False)
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(Category, related_name='category_food', blank=True, null=True, on_delete=models.SET_NULL)
     status = models.ForeignKey(StatusModel, related_name='status_food', on_delete=models.PROTECT)
     user_create = models.ForeignKey(User, related_name='user_create_food', blank=True, null=True, on_delete=models.SET_NULL)
@@ -95,24 +167,86 @@ class FoodItem(models.Model):
     created_on = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Daftar makanan aktif, urut created_on/price
+            models.Index(fields=['status', 'created_on', 'id']),
+            models.Index(fields=['status', 'price', 'id']),
+            # Filter kategori dan daftar tanpa filter
+            models.Index(fields=['category', 'created_on', 'id']),
+            models.Index(fields=['created_on', 'id']),
+            models.Index(fields=['price', 'id']),
+            models.Index(fields=['last_modified']),
+        ]
+
     def __str__(self):
         return f"{self.name} ({self.place.name})"
 
+    def delete_files(self):
+        if self.image:
+            self.image.delete(save=False)
+        self.delete_renditions()
+
+    def delete_renditions(self):
+        for formats in self.image_renditions.values():
+            for name in formats.values():
+                default_storage.delete(name)
+
     def save(self, *args, **kwargs):
+        image_changed = False
+        old = None
         if self.id:
             try:
                 old = FoodItem.objects.get(id=self.id)
                 if old.image != self.image:
                     if self.image:
-                        self.image = compress_image(self.image, 'food')
-                        old.image.delete()
-            except:
+                        image_changed = True
+                        self.image_renditions = {}
+            except FoodItem.DoesNotExist:
                 pass
-            super().save(*args, **kwargs)
-        else:
-            if self.image:
-                self.image = compress_image(self.image, 'food')
-            super().save(*args, **kwargs)
+        elif self.image:
+            image_changed = True
+        if image_changed:
+            # Gambar dikompres oleh worker (run_image_workers), bukan di request
+            self.image_status = self.IMAGE_PROCESSING
+        if self._state.adding and not self.code:
+            self.code = allocate_food_codes(1)[0]
+        super().save(*args, **kwargs)
+        if image_changed:
+            # Setelah commit: worker tidak boleh mengambil job untuk baris yang
+            # belum terlihat, dan rollback tidak boleh meninggalkan job atau
+            # menghapus gambar lama yang masih dipakai
+            food_id, source = self.id, self.image.name
+            if old is not None:
+                transaction.on_commit(old.delete_files)
+            transaction.on_commit(lambda: ImageJob.objects.create(food_id=food_id, source=source))
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    status_choices = (
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    food = models.ForeignKey(FoodItem, related_name='image_jobs', on_delete=models.CASCADE)
+    source = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=status_choices, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'id'])]
+
+    def __str__(self):
+        return f"{self.food_id} {self.source} ({self.status})"
 
 
 class FoodReview(models.Model):
@@ -121,8 +255,59 @@ class FoodReview(models.Model):
     place = models.ForeignKey(FoodPlace, related_name="reviews", on_delete=models.CASCADE, null=True, blank=True)
     rating = models.PositiveIntegerField()
     comment = models.TextField()
+    reviewer_latitude = models.FloatField(blank=True, null=True)
+    reviewer_longitude = models.FloatField(blank=True, null=True)
     distance_km = models.FloatField(help_text="Jarak dari reviewer ke lokasi (dalam km)")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['food', 'created_at', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.reviewer.username} - {self.food.name} ({self.rating}/5)"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_rating()
+        return instance
+
+    def remember_rating(self):
+        # Nilai terakhir yang tersimpan, dipakai untuk koreksi agregat rating
+        data = self.__dict__
+        if {'food_id', 'place_id', 'rating'} <= data.keys():
+            self._saved_rating = (data['food_id'], data['place_id'], data['rating'])
+        else:
+            self._saved_rating = None
+
+class SearchEntry(models.Model):
+    """
+    Dokumen pencarian teks (makanan, tempat, komentar review). Pada SQLite
+    dengan FTS5 tabel ini menjadi sumber konten indeks ``review_app_search_fts``
+    yang disinkronkan trigger, lihat ``review_app.search``.
+    """
+
+    FOOD = 'food'
+    PLACE = 'place'
+    REVIEW = 'review'
+    kind_choices = (
+        (FOOD, 'Makanan'),
+        (PLACE, 'Tempat makan'),
+        (REVIEW, 'Review'),
+    )
+
+    kind = models.CharField(max_length=10, choices=kind_choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField(blank=True, default='')
+    body = models.TextField(blank=True, default='')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_entry_unique_object'),
+        ]
+
     def __str__(self):
-        return f"{self.reviewer.username} - {self.food.name} ({self.rating}/5)"
\ No newline at end of file
+        return f"{self.kind}:{self.object_id} {self.title}"
@@ -0,0 +1,92 @@
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Now
+from django.dispatch import Signal
+from django.utils import timezone
+
+from review_app.models import FoodItem, FoodPlace, FoodReview
+from review_app.versions import bump_version
+
+# Dikirim setelah review_count/rating_sum suatu objek diubah lewat update F()
+rating_changed = Signal()
+
+
+def apply_rating_delta(model, pk, count_delta, sum_delta):
+    if pk is None:
+        return
+    new_count = F('review_count') + count_delta
+    new_sum = F('rating_sum') + sum_delta
+    model.objects.filter(pk=pk).update(
+        **{model.modified_field: timezone.now()},
+        review_count=new_count,
+        rating_sum=new_sum,
+        rating_avg=Case(
+            When(review_count=-count_delta, then=Value(0.0)),
+            default=Cast(new_sum, FloatField()) / Cast(new_count, FloatField()),
+            output_field=FloatField(),
+        ),
+    )
+    rating_changed.send(sender=model, pk=pk, count_delta=count_delta, sum_delta=sum_delta)
+
+
+def review_saved(review, created):
+    old = None if created else review._saved_rating
+    new = (review.food_id, review.place_id, review.rating)
+    if old == new:
+        return
+    if old is not None:
+        old_food, old_place, old_rating = old
+        apply_rating_delta(FoodItem, old_food, -1, -old_rating)
+        apply_rating_delta(FoodPlace, old_place, -1, -old_rating)
+    apply_rating_delta(FoodItem, review.food_id, 1, review.rating)
+    apply_rating_delta(FoodPlace, review.place_id, 1, review.rating)
+    review.remember_rating()
+
+
+def review_deleted(review):
+    food_id, place_id, rating = review._saved_rating or (
+        review.food_id, review.place_id, review.rating
+    )
+    apply_rating_delta(FoodItem, food_id, -1, -rating)
+    apply_rating_delta(FoodPlace, place_id, -1, -rating)
+
+
+def rebuild_rating_aggregates(food_model=FoodItem, place_model=FoodPlace, review_model=FoodReview):
+    """
+    Hitung ulang agregat dari tabel review. Hanya baris yang nilainya berubah
+    yang ditulis, dengan kolom waktu perubahannya (validator ETag/Last-Modified),
+    lalu versi data dinaikkan agar response cache tidak menyajikan rating lama.
+    Hasilnya jumlah baris yang berubah per jenis.
+    """
+    changed = {}
+    # Model historis (migrasi) tidak membawa atribut modified_field
+    for model, key, modified_field in (
+        (food_model, 'food', FoodItem.modified_field),
+        (place_model, 'place', FoodPlace.modified_field),
+    ):
+        reviews = (
+            review_model.objects.filter(**{key: OuterRef('pk')})
+            .order_by()
+            .values(key)
+        )
+        aggregates = {
+            'review_count': Coalesce(Subquery(reviews.annotate(c=Count('id')).values('c')), 0),
+            'rating_sum': Coalesce(Subquery(reviews.annotate(s=Sum('rating')).values('s')), 0),
+            'rating_avg': Coalesce(Subquery(reviews.annotate(a=Avg('rating')).values('a')), 0.0),
+        }
+        stale = model.objects.alias(**{f'new_{name}': value for name, value in aggregates.items()}).exclude(
+            **{name: F(f'new_{name}') for name in aggregates}
+        )
+        changed[key] = model.objects.filter(pk__in=stale.values('pk')).update(
+            **{modified_field: Now()}, **aggregates
+        )
+        if changed[key]:
+            _bump_after_commit(model)
+    return changed
+
+
+def _bump_after_commit(model):
+    bump_version(model)
+    # Response yang dihitung selama transaksi berjalan tidak boleh tetap terpakai
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_version(model))
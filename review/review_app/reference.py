@@ -0,0 +1,99 @@
+import copy
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from review_app.models import Category, StatusModel
+from review_app.versions import get_versions
+
+
+class ReferenceTable:
+    """
+    Salinan seluruh isi tabel referensi kecil di memori proses, untuk lookup
+    pk -> objek/nama dan nama -> pk tanpa query.
+
+    Sinyal model mengosongkan salinan di proses ini; perubahan dari proses
+    lain terbaca lewat versi data (``review_app.versions``) yang dicek paling
+    sering sekali per ``REFERENCE_CACHE_CHECK_INTERVAL`` detik.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+        self._rows = None
+        self._by_name = None
+        self._version = None
+        self._checked_at = 0.0
+
+    def __deepcopy__(self, memo):
+        # Field serializer di-deepcopy per instance; tabel tetap satu per proses
+        return self
+
+    def _fresh(self, now):
+        return now - self._checked_at < getattr(settings, 'REFERENCE_CACHE_CHECK_INTERVAL', 1)
+
+    def _load(self):
+        rows = self._rows
+        now = time.monotonic()
+        if rows is not None and self._fresh(now):
+            return rows, self._by_name
+        with self._lock:
+            # Versi dibaca sebelum memuat: perubahan selama memuat memicu muat ulang berikutnya
+            version = get_versions((self.model,))[0]
+            if self._rows is None or version != self._version:
+                rows = {obj.pk: obj for obj in self.model.objects.order_by('pk')}
+                by_name = {}
+                for obj in rows.values():
+                    by_name.setdefault(obj.name, []).append(obj.pk)
+                self._rows, self._by_name, self._version = rows, by_name, version
+            self._checked_at = now
+            return self._rows, self._by_name
+
+    async def aload(self):
+        # Dipanggil view async sebelum serialisasi: lookup berikutnya dalam
+        # interval cek tidak menyentuh database
+        if self._rows is None or not self._fresh(time.monotonic()):
+            await sync_to_async(self._load)()
+
+    def invalidate(self):
+        with self._lock:
+            self._rows = None
+            self._by_name = None
+
+    def all(self):
+        return [copy.copy(obj) for obj in self._load()[0].values()]
+
+    def first(self):
+        rows = self._load()[0]
+        return copy.copy(next(iter(rows.values()))) if rows else None
+
+    def get(self, pk):
+        obj = self._load()[0].get(pk)
+        return copy.copy(obj) if obj is not None else None
+
+    def exists(self, pk):
+        return pk in self._load()[0]
+
+    def name(self, pk):
+        obj = self._load()[0].get(pk)
+        return obj.name if obj is not None else None
+
+    def names(self):
+        """Peta pk -> nama, untuk lookup banyak baris sekaligus."""
+        return {pk: obj.name for pk, obj in self._load()[0].items()}
+
+    def pks_for_name(self, name):
+        return list(self._load()[1].get(name, ()))
+
+
+statuses = ReferenceTable(StatusModel)
+categories = ReferenceTable(Category)
+
+TABLES = {StatusModel: statuses, Category: categories}
+
+
+def active_status():
+    """Status "aktif" untuk daftar makanan: status pertama menurut pk."""
+    return statuses.first()
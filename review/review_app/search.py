@@ -0,0 +1,221 @@
+import re
+
+from django.apps import apps as global_apps
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+
+FTS_TABLE = 'review_app_search_fts'
+CONTENT_TABLE = 'review_app_searchentry'
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+BATCH_SIZE = 1000
+
+# model -> (jenis dokumen, kolom judul, kolom isi)
+SOURCES = {
+    'review_app.fooditem': ('food', 'name', 'description'),
+    'review_app.foodplace': ('place', 'name', 'address'),
+    'review_app.foodreview': ('review', None, 'comment'),
+}
+
+FTS_SQL = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, body, content='{CONTENT_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {CONTENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+)
+
+
+def create_fts(conn=connection):
+    """Buat tabel FTS5 dan trigger sinkronisasinya; ``False`` bila tidak didukung."""
+    if conn.vendor != 'sqlite':
+        return False
+    try:
+        with transaction.atomic(using=conn.alias), conn.cursor() as cursor:
+            for sql in FTS_SQL:
+                cursor.execute(sql)
+    except DatabaseError:
+        # SQLite tanpa modul FTS5, pencarian memakai fallback ORM
+        return False
+    return True
+
+
+def drop_fts(conn=connection):
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        for suffix in ('_ai', '_ad', '_au'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}{suffix}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def fts_available(conn=connection):
+    if conn.vendor != 'sqlite':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _document(instance):
+    source = SOURCES.get(instance._meta.label_lower)
+    if source is None:
+        return None
+    kind, title_field, body_field = source
+    title = getattr(instance, title_field) if title_field else ''
+    return kind, title or '', getattr(instance, body_field) or ''
+
+
+def _upsert(entry_model, entries):
+    entry_model.objects.bulk_create(
+        entries,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['title', 'body'],
+    )
+
+
+def index_many(instances):
+    from review_app.models import SearchEntry
+
+    entries = []
+    for instance in instances:
+        document = _document(instance)
+        if document is not None and instance.pk is not None:
+            kind, title, body = document
+            entries.append(SearchEntry(kind=kind, object_id=instance.pk, title=title, body=body))
+    if entries:
+        _upsert(SearchEntry, entries)
+
+
+def index(instance, update_fields=None):
+    source = SOURCES.get(instance._meta.label_lower)
+    if source is None:
+        return
+    # Simpan parsial yang tidak menyentuh kolom teks tidak perlu diindeks ulang
+    if update_fields is not None and not set(update_fields) & set(filter(None, source[1:])):
+        return
+    index_many([instance])
+
+
+def remove(instance):
+    from review_app.models import SearchEntry
+
+    source = SOURCES.get(instance._meta.label_lower)
+    if source is not None:
+        SearchEntry.objects.filter(kind=source[0], object_id=instance.pk).delete()
+
+
+def rebuild(apps=global_apps, using='default'):
+    """Isi ulang seluruh indeks dari tabel sumber; dipakai migrasi dan command rebuild."""
+    from django.db import connections
+
+    SearchEntry = apps.get_model('review_app', 'SearchEntry')
+    conn = connections[using]
+    counts = {}
+    with transaction.atomic(using=using):
+        SearchEntry.objects.using(using).all().delete()
+        for label, (kind, title_field, body_field) in SOURCES.items():
+            model = apps.get_model(label)
+            fields = ['id', body_field] + ([title_field] if title_field else [])
+            rows = model.objects.using(using).order_by('id').values(*fields).iterator(chunk_size=BATCH_SIZE)
+            batch = []
+            counts[kind] = 0
+            for row in rows:
+                batch.append(SearchEntry(
+                    kind=kind,
+                    object_id=row['id'],
+                    title=(row[title_field] if title_field else '') or '',
+                    body=row[body_field] or '',
+                ))
+                if len(batch) >= BATCH_SIZE:
+                    SearchEntry.objects.using(using).bulk_create(batch)
+                    counts[kind] += len(batch)
+                    batch = []
+            if batch:
+                SearchEntry.objects.using(using).bulk_create(batch)
+                counts[kind] += len(batch)
+        if fts_available(conn):
+            with conn.cursor() as cursor:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+    return counts
+
+
+def terms(query):
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def search(query, kinds=None, limit=20):
+    """
+    Cari dokumen, hasilnya list dict ``kind, id, title, snippet, score``
+    terurut dari yang paling relevan. Dengan FTS5 skor adalah BM25 (judul
+    diberi bobot lebih); tanpa FTS5 dipakai ``icontains`` dengan skor jumlah
+    kata yang cocok di judul.
+    """
+    words = terms(query)
+    if not words:
+        return []
+    if fts_available():
+        return _search_fts(words, kinds, limit)
+    return _search_fallback(words, kinds, limit)
+
+
+def _search_fts(words, kinds, limit):
+    # Tiap kata dikutip agar operator FTS5 dari input user tidak ikut terbaca
+    match = ' '.join(f'"{word}"*' for word in words)
+    sql = f"""
+        SELECT e.kind, e.object_id, e.title,
+               snippet({FTS_TABLE}, 1, '', '', '...', 16),
+               bm25({FTS_TABLE}, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS rank
+        FROM {FTS_TABLE} JOIN {CONTENT_TABLE} e ON e.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH %s
+    """
+    params = [match]
+    if kinds:
+        sql += f" AND e.kind IN ({', '.join(['%s'] * len(kinds))})"
+        params.extend(kinds)
+    sql += ' ORDER BY rank LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [
+            {'kind': kind, 'id': object_id, 'title': title, 'snippet': snippet, 'score': round(-rank, 6)}
+            for kind, object_id, title, snippet, rank in cursor.fetchall()
+        ]
+
+
+def _search_fallback(words, kinds, limit):
+    from review_app.models import SearchEntry
+
+    queryset = SearchEntry.objects.all()
+    for word in words:
+        queryset = queryset.filter(Q(title__icontains=word) | Q(body__icontains=word))
+    if kinds:
+        queryset = queryset.filter(kind__in=kinds)
+    score = sum(
+        (Case(When(title__icontains=word, then=Value(1)), default=Value(0), output_field=IntegerField())
+         for word in words),
+        Value(0),
+    )
+    queryset = queryset.annotate(score=score).order_by('-score', 'id')[:limit]
+    return [
+        {
+            'kind': entry.kind,
+            'id': entry.object_id,
+            'title': entry.title,
+            'snippet': entry.body[:120],
+            'score': entry.score,
+        }
+        for entry in queryset
+    ]
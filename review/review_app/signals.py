@@ -0,0 +1,103 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from review_app import autocomplete, ratings, reference, search
+from review_app.models import Category, FoodItem, FoodPlace, FoodReview, StatusModel
+from review_app.versions import bump_version
+
+# Dikirim importer massal setelah tiap chunk tersimpan; bulk_create tidak memicu post_save
+bulk_imported = Signal()
+
+VERSIONED_MODELS = (FoodPlace, FoodItem, Category, StatusModel, FoodReview)
+
+
+@receiver(post_save, sender=FoodReview)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        ratings.review_saved(instance, created)
+
+
+@receiver(post_delete, sender=FoodReview)
+def update_rating_on_delete(sender, instance, **kwargs):
+    ratings.review_deleted(instance)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(bulk_imported)
+def bump_data_version(sender, **kwargs):
+    if sender not in VERSIONED_MODELS:
+        return
+    bump_version(sender)
+    # Naikkan lagi setelah commit: response yang dihitung dari data sebelum
+    # commit selama transaksi berjalan tidak boleh tetap terpakai
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_version(sender))
+
+
+@receiver(post_save, sender=FoodItem)
+@receiver(post_save, sender=FoodPlace)
+@receiver(post_save, sender=FoodReview)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        search.index(instance, update_fields)
+
+
+@receiver(post_delete, sender=FoodItem)
+@receiver(post_delete, sender=FoodPlace)
+@receiver(post_delete, sender=FoodReview)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove(instance)
+
+
+@receiver(bulk_imported)
+def index_imported(sender, instances, **kwargs):
+    search.index_many(instances)
+
+
+AUTOCOMPLETE_KINDS = {
+    FoodItem: autocomplete.FOOD,
+    FoodPlace: autocomplete.PLACE,
+    Category: autocomplete.CATEGORY,
+}
+
+
+@receiver(post_save, sender=FoodItem)
+@receiver(post_save, sender=FoodPlace)
+@receiver(post_save, sender=Category)
+def update_autocomplete(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not {'name', 'category'} & set(update_fields)):
+        return
+    autocomplete.object_saved(AUTOCOMPLETE_KINDS[sender], instance)
+
+
+@receiver(post_delete, sender=FoodItem)
+@receiver(post_delete, sender=FoodPlace)
+@receiver(post_delete, sender=Category)
+def remove_from_autocomplete(sender, instance, **kwargs):
+    autocomplete.object_deleted(AUTOCOMPLETE_KINDS[sender], instance)
+
+
+@receiver(bulk_imported)
+def autocomplete_imported(sender, instances, **kwargs):
+    if sender in AUTOCOMPLETE_KINDS:
+        for instance in instances:
+            autocomplete.object_saved(AUTOCOMPLETE_KINDS[sender], instance)
+
+
+@receiver(ratings.rating_changed)
+def update_autocomplete_popularity(sender, pk, count_delta, **kwargs):
+    if sender in AUTOCOMPLETE_KINDS:
+        autocomplete.popularity_changed(AUTOCOMPLETE_KINDS[sender], pk, count_delta)
+
+
+@receiver(post_save, sender=StatusModel)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=StatusModel)
+@receiver(post_delete, sender=Category)
+def invalidate_reference_data(sender, **kwargs):
+    table = reference.TABLES[sender]
+    table.invalidate()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(table.invalidate)
@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def apply_pragmas(cursor, pragmas):
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Terapkan ``SQLITE_PRAGMAS`` ke setiap koneksi SQLite baru. Dengan
+    ``CONN_MAX_AGE`` koneksi dipakai ulang, jadi ini hanya berjalan sekali per
+    koneksi, bukan per request.
+    """
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    if connection.is_in_memory_db():
+        # WAL dan mmap tidak berlaku untuk database memori (test)
+        pragmas = {name: value for name, value in pragmas.items() if name not in ('journal_mode', 'mmap_size')}
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor, pragmas)
@@ -1,3 +1,511 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.test import RequestFactory, TestCase, override_settings
+
+from api import projections
+from api.serializers import FoodItemSerializer, FoodPlaceSerializer, FoodReviewReadSerializer
+from review_app import geo, image_jobs, search
+from review_app.management.commands import backfill_review_distance
+from review_app.models import (
+    Category,
+    CodeCounter,
+    FoodItem,
+    FoodPlace,
+    FoodReview,
+    ImageJob,
+    StatusModel,
+    User,
+    allocate_food_codes,
+)
+from review_app.ratings import rebuild_rating_aggregates
+from review_app.versions import get_versions
+
+
+class ProjectionEquivalenceTest(TestCase):
+    """Output ``api.projections`` harus sama persis dengan serializer aslinya."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reviewer', password='rahasia', is_reviewer=True)
+        active = StatusModel.objects.create(name='Aktif')
+        inactive = StatusModel.objects.create(name='Tidak Aktif')
+        noodle = Category.objects.create(name='Mie', status=active)
+        cls.place = FoodPlace.objects.create(
+            name='Warung A', description='', latitude=3.59, longitude=98.67, address='Jl. A', status=active
+        )
+        FoodPlace.objects.create(
+            name='Warung B', description='Dekat pasar', latitude=-6.2, longitude=106.8, address='Jl. B', status=inactive
+        )
+        cls.food = FoodItem.objects.create(
+            place=cls.place, name='Mie Aceh', price='25000.50', description='Pedas', category=noodle, status=active,
+            image_renditions={'320': {'webp': 'food_images/1-320.webp', 'jpeg': 'food_images/1-320.jpg'}},
+        )
+        # Tanpa kategori, tanpa gambar
+        FoodItem.objects.create(place=cls.place, name='Teh', price=5000, description='', status=inactive)
+        FoodItem.objects.create(
+            place=cls.place, name='Sate', price=30000, description='', status=active, category=noodle, image='',
+        )
+        FoodReview.objects.create(
+            food=cls.food, place=cls.place, reviewer=cls.user, rating=4, comment='Enak', distance_km=1.25
+        )
+        # Review tanpa tempat
+        FoodReview.objects.create(food=cls.food, place=None, reviewer=cls.user, rating=2, comment='Biasa', distance_km=0)
+
+    def assertSameAsSerializer(self, projection, serializer_class, queryset, context=None):
+        rows = list(projection.queryset(queryset))
+        expected = serializer_class(
+            serializer_class.setup_eager_loading(queryset), many=True, context=context or {}
+        ).data
+        self.assertEqual(projection.data(rows, context), [dict(item) for item in expected])
+        # Urutan key ikut sama, karena JSON response dibandingkan apa adanya
+        self.assertEqual([list(item) for item in projection.data(rows, context)], [list(item) for item in expected])
+
+    def test_food_places(self):
+        self.assertSameAsSerializer(projections.food_places, FoodPlaceSerializer, FoodPlace.objects.order_by('id'))
+
+    def test_food_items(self):
+        self.assertSameAsSerializer(projections.food_items, FoodItemSerializer, FoodItem.objects.order_by('id'))
+
+    def test_food_items_with_request(self):
+        FoodItem.objects.filter(pk=self.food.pk).update(image='food_images/mie.jpg')
+        context = {'request': RequestFactory().get('/api/foods/filter/')}
+        self.assertSameAsSerializer(
+            projections.food_items, FoodItemSerializer, FoodItem.objects.order_by('id'), context
+        )
+
+    def test_food_reviews(self):
+        self.assertSameAsSerializer(
+            projections.food_reviews, FoodReviewReadSerializer, FoodReview.objects.order_by('id')
+        )
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_food_reviews_utc(self):
+        self.assertSameAsSerializer(
+            projections.food_reviews, FoodReviewReadSerializer, FoodReview.objects.order_by('id')
+        )
+
+    def test_empty(self):
+        self.assertEqual(projections.food_items.data(projections.food_items.queryset(FoodItem.objects.none())), [])
+
+
+class NearbyFilterTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.active = StatusModel.objects.create(name='Aktif')
+
+    def create_place(self, name, latitude, longitude):
+        return FoodPlace.objects.create(
+            name=name, latitude=latitude, longitude=longitude, address='Jl. Test', status=self.active
+        )
+
+    def nearby(self, latitude, longitude, radius_km):
+        places = FoodPlace.objects.filter(geo.nearby_filter(latitude, longitude, radius_km))
+        return sorted(place.name for place in places)
+
+    def test_antimeridian(self):
+        # Dua sisi garis bujur 180, berjarak sekitar 2 km
+        self.create_place('Timur', 0.0, 179.99)
+        self.create_place('Barat', 0.0, -179.99)
+        self.create_place('Jauh', 0.0, 178.0)
+        self.assertAlmostEqual(geo.haversine_km(0.0, 179.99, 0.0, -179.99), 2.22, places=2)
+        self.assertEqual(self.nearby(0.0, 179.99, 10), ['Barat', 'Timur'])
+        self.assertEqual(self.nearby(0.0, -179.99, 10), ['Barat', 'Timur'])
+
+    def test_pole(self):
+        # Berseberangan bujur di dekat kutub utara, berjarak sekitar 2 km
+        self.create_place('Bujur 0', 89.99, 0.0)
+        self.create_place('Bujur 180', 89.99, 180.0)
+        self.create_place('Khatulistiwa', 0.0, 0.0)
+        self.assertEqual(geo.bounding_box(89.99, 0.0, 10)[2:], (-180.0, 180.0))
+        self.assertEqual(self.nearby(89.99, 0.0, 10), ['Bujur 0', 'Bujur 180'])
+
+    def test_south_pole(self):
+        self.create_place('Kutub', -90.0, 0.0)
+        self.create_place('Dekat kutub', -89.95, 45.0)
+        self.assertEqual(self.nearby(-89.99, -120.0, 10), ['Dekat kutub', 'Kutub'])
+
+    def test_bounding_box_contains_radius(self):
+        for latitude in (0.0, 45.0, -60.0, 80.0):
+            min_lat, max_lat, min_lon, max_lon = geo.bounding_box(latitude, 10.0, 25)
+            with self.subTest(latitude=latitude):
+                self.assertLessEqual(geo.haversine_km(latitude, 10.0, max_lat, 10.0), 25.001)
+                self.assertGreaterEqual(geo.haversine_km(latitude, 10.0, latitude, max_lon), 25 * 0.999)
+
+
+class BackfillReviewDistanceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reviewer', password='rahasia', is_reviewer=True)
+        active = StatusModel.objects.create(name='Aktif')
+        place = FoodPlace.objects.create(
+            name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=active
+        )
+        cls.food = FoodItem.objects.create(place=place, name='Mie Aceh', price=25000, description='', status=active)
+
+    def create_review(self, latitude=None, longitude=None, distance_km=0):
+        return FoodReview.objects.create(
+            food=self.food, place=self.food.place, reviewer=self.user, rating=4, comment='Enak',
+            reviewer_latitude=latitude, reviewer_longitude=longitude, distance_km=distance_km,
+        )
+
+    def test_numpy_haversine_matches_geo(self):
+        points = [
+            (3.59, 98.67, 3.60, 98.68),
+            (-6.2, 106.8, 3.59, 98.67),
+            (0.0, 179.99, 0.0, -179.99),
+            (89.99, 0.0, 89.99, 180.0),
+            (51.5, -0.12, -33.87, 151.21),
+            (10.0, 10.0, -10.0, -170.0),
+            (1.0, 2.0, 1.0, 2.0),
+        ]
+        coords = np.array(points, dtype=np.float64)
+        distances = backfill_review_distance.haversine_km(coords[:, 0], coords[:, 1], coords[:, 2], coords[:, 3])
+        for point, distance in zip(points, distances.tolist()):
+            with self.subTest(point=point):
+                self.assertAlmostEqual(distance, geo.haversine_km(*point), places=6)
+
+    def test_backfill(self):
+        reviews = [self.create_review(3.60 + i / 100, 98.68, distance_km=999) for i in range(5)]
+        legacy = self.create_review(distance_km=7.5)
+        version = get_versions([FoodReview])
+        out = StringIO()
+        call_command('backfill_review_distance', chunk_size=2, stdout=out)
+        self.assertNotEqual(get_versions([FoodReview]), version)
+        for review in reviews:
+            review.refresh_from_db()
+            self.assertAlmostEqual(
+                review.distance_km, geo.haversine_km(review.reviewer_latitude, 98.68, 3.59, 98.67), places=6
+            )
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.distance_km, 7.5)
+        self.assertIn('5 review diperbarui', out.getvalue())
+        self.assertIn('1 review tanpa koordinat reviewer dilewati', out.getvalue())
+
+
+class RatingAggregatesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reviewer', password='rahasia', is_reviewer=True)
+        active = StatusModel.objects.create(name='Aktif')
+        cls.place = FoodPlace.objects.create(name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=active)
+        cls.other_place = FoodPlace.objects.create(name='Warung B', latitude=3.6, longitude=98.68, address='Jl. B', status=active)
+        cls.food = FoodItem.objects.create(place=cls.place, name='Mie Aceh', price=25000, description='', status=active)
+        cls.other_food = FoodItem.objects.create(place=cls.other_place, name='Sate', price=20000, description='', status=active)
+
+    def review(self, rating, food=None, place=None):
+        food = food or self.food
+        return FoodReview.objects.create(
+            food=food, place=place or food.place, reviewer=self.user, rating=rating, comment='Enak', distance_km=1
+        )
+
+    def assertAggregates(self, obj, count, total, avg):
+        obj.refresh_from_db()
+        self.assertEqual((obj.review_count, obj.rating_sum), (count, total))
+        self.assertAlmostEqual(obj.rating_avg, avg)
+
+    def test_create(self):
+        self.review(4)
+        self.review(3)
+        self.assertAggregates(self.food, 2, 7, 3.5)
+        self.assertAggregates(self.place, 2, 7, 3.5)
+        self.assertAggregates(self.other_food, 0, 0, 0.0)
+
+    def test_edit_rating(self):
+        review = self.review(4)
+        self.review(2)
+        review.rating = 5
+        review.save()
+        self.assertAggregates(self.food, 2, 7, 3.5)
+        # Simpan ulang tanpa perubahan rating tidak mengubah agregat
+        review.comment = 'Enak sekali'
+        review.save()
+        self.assertAggregates(self.food, 2, 7, 3.5)
+
+    def test_move_review(self):
+        review = self.review(4)
+        self.review(2)
+        review = FoodReview.objects.get(pk=review.pk)
+        review.food, review.place = self.other_food, self.other_place
+        review.save()
+        self.assertAggregates(self.food, 1, 2, 2.0)
+        self.assertAggregates(self.place, 1, 2, 2.0)
+        self.assertAggregates(self.other_food, 1, 4, 4.0)
+        self.assertAggregates(self.other_place, 1, 4, 4.0)
+
+    def test_delete(self):
+        first = self.review(5)
+        second = self.review(2)
+        first.delete()
+        self.assertAggregates(self.food, 1, 2, 2.0)
+        # Review terakhir: count kembali 0, rata-rata 0 (bukan pembagian dengan nol)
+        second.delete()
+        self.assertAggregates(self.food, 0, 0, 0.0)
+        self.assertAggregates(self.place, 0, 0, 0.0)
+
+    def test_delete_after_edit_uses_saved_rating(self):
+        review = self.review(5)
+        review.rating = 1
+        review.delete()
+        self.assertAggregates(self.food, 0, 0, 0.0)
+
+    def test_review_without_place(self):
+        FoodReview.objects.create(food=self.food, place=None, reviewer=self.user, rating=3, comment='-', distance_km=0)
+        self.assertAggregates(self.food, 1, 3, 3.0)
+        self.assertAggregates(self.place, 0, 0, 0.0)
+
+    def test_stale_instance_save_keeps_aggregates(self):
+        stale = FoodItem.objects.get(pk=self.food.pk)
+        self.review(4)
+        stale.name = 'Mie Aceh Spesial'
+        stale.save()
+        self.assertAggregates(self.food, 1, 4, 4.0)
+
+    def test_rebuild(self):
+        self.review(4)
+        self.review(1)
+        FoodItem.objects.filter(pk=self.food.pk).update(review_count=9, rating_sum=9, rating_avg=9)
+        stamps = dict(FoodItem.objects.values_list('pk', 'last_modified'))
+        place_stamp = FoodPlace.objects.values_list('updated_on', flat=True).get(pk=self.place.pk)
+        before = get_versions([FoodItem, FoodPlace])
+        call_command('rebuild_rating_aggregates', stdout=StringIO())
+        self.assertAggregates(self.food, 2, 5, 2.5)
+        self.assertAggregates(self.other_food, 0, 0, 0.0)
+        # Hanya baris yang berubah yang mendapat waktu perubahan baru
+        self.assertGreater(FoodItem.objects.get(pk=self.food.pk).last_modified, stamps[self.food.pk])
+        self.assertEqual(FoodItem.objects.get(pk=self.other_food.pk).last_modified, stamps[self.other_food.pk])
+        self.assertEqual(FoodPlace.objects.values_list('updated_on', flat=True).get(pk=self.place.pk), place_stamp)
+        after = get_versions([FoodItem, FoodPlace])
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], before[1])
+
+        self.assertEqual(rebuild_rating_aggregates(), {'food': 0, 'place': 0})
+        self.assertEqual(get_versions([FoodItem, FoodPlace]), after)
+
+
+class ImageJobQueueTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.active = StatusModel.objects.create(name='Aktif')
+        cls.place = FoodPlace.objects.create(name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=cls.active)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = self.settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def image(self, name='mie.jpg'):
+        return SimpleUploadedFile(name, b'bukan-gambar-asli', content_type='image/jpeg')
+
+    def create_food(self, **kwargs):
+        return FoodItem.objects.create(
+            place=self.place, name='Mie Aceh', price=25000, description='', status=self.active, **kwargs
+        )
+
+    def test_new_image_queues_job_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            food = self.create_food(image=self.image())
+            self.assertFalse(ImageJob.objects.exists())
+        job = ImageJob.objects.get()
+        self.assertEqual((job.food_id, job.source, job.status), (food.pk, food.image.name, ImageJob.PENDING))
+        self.assertEqual(food.image_status, FoodItem.IMAGE_PROCESSING)
+
+    def test_changed_image_queues_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            food = self.create_food(image=self.image())
+        old_name = food.image.name
+        with self.captureOnCommitCallbacks(execute=True):
+            food.image = self.image('mie-baru.jpg')
+            food.save()
+        self.assertEqual(ImageJob.objects.count(), 2)
+        self.assertEqual(ImageJob.objects.latest('id').source, food.image.name)
+        # Gambar lama dihapus setelah commit
+        self.assertFalse(food.image.storage.exists(old_name))
+
+    def test_save_without_image_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            food = self.create_food(image=self.image())
+        FoodItem.objects.filter(pk=food.pk).update(image_status=FoodItem.IMAGE_READY)
+        food.refresh_from_db()
+        with self.captureOnCommitCallbacks(execute=True):
+            food.name = 'Mie Aceh Spesial'
+            food.save()
+        self.assertEqual(ImageJob.objects.count(), 1)
+        self.assertEqual(food.image_status, FoodItem.IMAGE_READY)
+        with self.captureOnCommitCallbacks(execute=True):
+            plain = self.create_food()
+        self.assertFalse(ImageJob.objects.filter(food=plain).exists())
+        self.assertEqual(plain.image_status, FoodItem.IMAGE_READY)
+
+    def test_rollback_leaves_no_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            food = self.create_food(image=self.image())
+        old_name = food.image.name
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    food.image = self.image('mie-baru.jpg')
+                    food.save()
+                    self.create_food(image=self.image('sate.jpg'))
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(ImageJob.objects.count(), 1)
+        # Baris lama masih menunjuk gambar lama, jadi file-nya tidak boleh hilang
+        self.assertEqual(FoodItem.objects.get(pk=food.pk).image.name, old_name)
+        self.assertTrue(food.image.storage.exists(old_name))
+
+
+
+class ClaimJobsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        active = StatusModel.objects.create(name='Aktif')
+        place = FoodPlace.objects.create(name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=active)
+        cls.food = FoodItem.objects.create(place=place, name='Mie Aceh', price=25000, description='', status=active)
+
+    def test_claim(self):
+        jobs = [ImageJob.objects.create(food=self.food, source=f'food_images/{i}.jpg') for i in range(4)]
+        ImageJob.objects.filter(pk=jobs[1].pk).update(status=ImageJob.RUNNING)
+        # Daftar pending, satu update per job, lalu satu query untuk semua job yang didapat
+        with self.assertNumQueries(1 + 2 + 1):
+            claimed = image_jobs.claim_jobs(2)
+        self.assertEqual([job.pk for job in claimed], [jobs[0].pk, jobs[2].pk])
+        self.assertEqual([(job.status, job.attempts) for job in claimed], [(ImageJob.RUNNING, 1)] * 2)
+        self.assertEqual([job.pk for job in image_jobs.claim_jobs(10)], [jobs[3].pk])
+        with self.assertNumQueries(1):
+            self.assertEqual(image_jobs.claim_jobs(10), [])
+
+
+class CodeCounterTest(TestCase):
+    def test_sequential_and_unique(self):
+        self.assertEqual(CodeCounter.allocate('uji'), range(1, 2))
+        self.assertEqual(CodeCounter.allocate('uji', 3), range(2, 5))
+        self.assertEqual(CodeCounter.allocate('uji'), range(5, 6))
+        numbers = [n for _ in range(20) for n in CodeCounter.allocate('uji', 2)]
+        self.assertEqual(numbers, list(range(6, 46)))
+        # Counter lain berdiri sendiri
+        self.assertEqual(CodeCounter.allocate('lain'), range(1, 2))
+
+    def test_rolled_back_allocation(self):
+        CodeCounter.allocate('uji', 2)
+        try:
+            with transaction.atomic():
+                self.assertEqual(CodeCounter.allocate('uji', 5), range(3, 8))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        # Nomor dari transaksi yang di-rollback tidak pernah terpakai, boleh dipakai ulang
+        self.assertEqual(CodeCounter.objects.get(name='uji').value, 2)
+        self.assertEqual(CodeCounter.allocate('uji'), range(3, 4))
+
+    def test_rolled_back_counter_creation(self):
+        try:
+            with transaction.atomic():
+                CodeCounter.allocate('baru')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertFalse(CodeCounter.objects.filter(name='baru').exists())
+        self.assertEqual(CodeCounter.allocate('baru'), range(1, 2))
+
+    def test_food_codes(self):
+        active = StatusModel.objects.create(name='Aktif')
+        place = FoodPlace.objects.create(name='Warung A', latitude=3.59, longitude=98.67, address='Jl. A', status=active)
+        foods = [
+            FoodItem.objects.create(place=place, name=f'Makanan {i}', price=1000, description='', status=active)
+            for i in range(3)
+        ]
+        codes = [food.code for food in foods]
+        self.assertEqual(len(set(codes)), 3)
+        self.assertEqual(allocate_food_codes(2)[0][:3], 'FD-')
+        next_number = int(allocate_food_codes()[0][3:])
+        self.assertEqual(next_number, int(codes[-1][3:]) + 3)
+        # Kode tidak berubah saat disimpan ulang
+        foods[0].save()
+        foods[0].refresh_from_db()
+        self.assertEqual(foods[0].code, codes[0])
+
+
+class SearchSyncTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.active = StatusModel.objects.create(name='Aktif')
+        cls.place = FoodPlace.objects.create(
+            name='Warung Bu Tini', latitude=3.59, longitude=98.67, address='Jl. Merdeka', status=cls.active
+        )
+
+    def hits(self, query, kinds=None):
+        return [(hit['kind'], hit['id']) for hit in search.search(query, kinds)]
+
+    def test_fts_table_present(self):
+        self.assertTrue(search.fts_available())
+
+    def test_create_update_delete(self):
+        food = FoodItem.objects.create(
+            place=self.place, name='Soto Medan', price=20000, description='Kuah santan kuning', status=self.active
+        )
+        self.assertEqual(self.hits('soto'), [('food', food.pk)])
+        self.assertEqual(self.hits('santan', ['food']), [('food', food.pk)])
+
+        food.name = 'Mie Aceh'
+        food.save()
+        self.assertEqual(self.hits('soto'), [])
+        self.assertEqual(self.hits('aceh'), [('food', food.pk)])
+
+        # Simpan parsial tanpa kolom teks tidak mengubah indeks
+        food.price = 25000
+        food.save(update_fields=['price'])
+        self.assertEqual(self.hits('aceh'), [('food', food.pk)])
+
+        review = FoodReview.objects.create(
+            food=food, reviewer=User.objects.create_user('budi'), rating=5, comment='Pedasnya pas', distance_km=1
+        )
+        self.assertEqual(self.hits('pedas'), [('review', review.pk)])
+
+        food.delete()
+        self.assertEqual(self.hits('aceh'), [])
+        self.assertEqual(self.hits('pedas'), [])
+
+    def test_title_ranked_first(self):
+        in_body = FoodItem.objects.create(
+            place=self.place, name='Nasi Putih', description='Teman rendang', price=5000, status=self.active
+        )
+        in_title = FoodItem.objects.create(
+            place=self.place, name='Rendang Daging', description='Daging sapi', price=30000, status=self.active
+        )
+        self.assertEqual(self.hits('rendang'), [('food', in_title.pk), ('food', in_body.pk)])
+
+    def test_query_syntax_is_literal(self):
+        food = FoodItem.objects.create(
+            place=self.place, name='Soto Medan', price=20000, description='Kuah santan', status=self.active
+        )
+        for query in ['"soto', 'soto*', '(soto', '-soto', '^medan', 'soto:', "soto'); --"]:
+            with self.subTest(query=query):
+                self.assertEqual(self.hits(query), [('food', food.pk)])
+        # Operator FTS5 dicari sebagai kata biasa, bukan sintaks
+        for query in ['soto AND', 'soto OR kari', 'NEAR(soto medan)', 'title:soto']:
+            with self.subTest(query=query):
+                self.assertEqual(self.hits(query), [])
+        food.description = 'Soto and near or title'
+        food.save()
+        self.assertEqual(self.hits('soto AND near OR title'), [('food', food.pk)])
+        self.assertEqual(self.hits('()*"-:'), [])
+
+    def test_fallback_without_fts(self):
+        food = FoodItem.objects.create(
+            place=self.place, name='Soto Medan', price=20000, description='Kuah santan', status=self.active
+        )
+        with mock.patch.object(search, 'fts_available', return_value=False):
+            self.assertEqual(self.hits('soto "medan'), [('food', food.pk)])
+            food.delete()
+            self.assertEqual(self.hits('soto'), [])
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+VERSION_KEY = 'data-version:{}'
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def _initial():
+    # Mulai dari waktu sekarang agar versi yang hilang dari cache tidak kembali
+    # ke angka lama yang masih dipakai sebagai kunci response tersimpan
+    return time.time_ns() // 1000
+
+
+def bump_version(model):
+    cache = _cache()
+    key = _key(model)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial(), timeout=None)
+        return cache.incr(key)
+
+
+def get_versions(models):
+    cache = _cache()
+    keys = [_key(model) for model in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial(), timeout=None)
+            found[key] = cache.get(key)
+    return tuple(found[key] for key in keys)